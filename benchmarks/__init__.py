@@ -0,0 +1 @@
+"""Performance benchmarks of net-schema, run with `python -m benchmarks`."""
@@ -0,0 +1,142 @@
+"""Run the benchmarks: `python -m benchmarks --help`."""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from .inventory import generate_inventory
+from .suite import (
+    BASELINE,
+    BENCHMARKS,
+    DEFAULT_SIZES,
+    DEFAULT_THRESHOLD,
+    IMPORT_TIME_BUDGET_US,
+    compare,
+    environment,
+    import_time,
+    load_baseline,
+    run,
+    save_baseline,
+)
+
+
+@click.command()
+@click.option(
+    "--size",
+    "sizes",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help="Number of documents in the inventory (can be repeated)  [default: 1000]",
+)
+@click.option(
+    "--benchmark",
+    "names",
+    type=click.Choice(list(BENCHMARKS)),
+    multiple=True,
+    help="Benchmark to run (can be repeated)  [default: all]",
+)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help="Runs of each benchmark; the fastest is kept",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False),
+    default=str(BASELINE),
+    help="Baseline to compare with  [default: benchmarks/baseline.json]",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0, max=1),
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    help="Drop in throughput, as a fraction of the baseline, reported as a regression",
+)
+@click.option(
+    "--save",
+    is_flag=True,
+    help="Store the results as the new baseline",
+)
+@click.option(
+    "--workdir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory to keep the generated inventories in, for reuse between runs",
+)
+def main(
+    sizes: tuple[int, ...],
+    names: tuple[str, ...],
+    repeat: int,
+    baseline: str,
+    threshold: float,
+    save: bool,
+    workdir: str | None,
+):
+    """
+    Benchmark net-schema against synthetic inventories and compare with the baseline.
+
+    Also checks that importing the CLI stays within its startup time budget.
+    """
+    console = Console()
+    stored = load_baseline(baseline)
+    if stored["environment"] and stored["environment"] != environment():
+        console.print(
+            "The baseline was recorded on a different environment "
+            f"({stored['environment']}); comparisons may not be meaningful.",
+            style="yellow",
+        )
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="net-schema-bench-") as tmp:
+        for size in sizes or DEFAULT_SIZES:
+            directory = Path(workdir or tmp) / str(size)
+            paths = sorted(directory.glob("*.yml"))
+            if len(paths) != size:
+                console.print(f"Generating {size} documents in {directory}", style="dim")
+                paths = generate_inventory(directory, size)
+            results[str(size)] = run(paths, list(names) or None, repeat)
+
+    table = Table(header_style="bold magenta")
+    for column in ("Documents", "Benchmark", "Docs/s", "Baseline", "Change"):
+        table.add_column(column, justify="left" if column == "Benchmark" else "right")
+    rows = compare(results, stored, threshold)
+    for count, name, value, expected, regressed in rows:
+        change = "--" if expected is None else f"{(value / expected - 1) * 100:+.1f}%"
+        table.add_row(
+            count,
+            name,
+            f"{value:,.0f}",
+            "--" if expected is None else f"{expected:,.0f}",
+            f"[red]{change}[/red]" if regressed else change,
+        )
+    console.print(table)
+
+    startup = import_time(repeat)
+    console.print(
+        f"CLI import time: {startup / 1000:.1f} ms "
+        f"(budget {IMPORT_TIME_BUDGET_US / 1000:.0f} ms)",
+        style="red" if startup > IMPORT_TIME_BUDGET_US else None,
+    )
+
+    if save:
+        save_baseline(results, baseline)
+        console.print(f"Baseline saved to {baseline}", style="dim")
+    elif any(row[-1] for row in rows):
+        console.print(
+            f"Throughput dropped by more than {threshold:.0%} of the baseline.", style="red"
+        )
+        sys.exit(1)
+    if startup > IMPORT_TIME_BUDGET_US:
+        console.print("Importing the CLI exceeds its startup time budget.", style="red")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Generate synthetic host_vars inventories for benchmarking."""
+
+from pathlib import Path
+
+# Every nth router has errors: an interface name not matching the schema pattern and
+# a public remote ASN, so the error paths are exercised too.
+INVALID_EVERY = 10
+
+# Interfaces per router, as in `examples/host_vars/rtr001.yml`.
+INTERFACES = 5
+
+
+def _router(index: int) -> str:
+    """Return the host_vars of a router, in the shape of `examples/host_vars`."""
+    # Spread the addresses of the routers over 10.0.0.0/8.
+    prefix = f"10.{index // 256 % 256}"
+    third = index % 256 * INTERFACES % 256
+    invalid = index % INVALID_EVERY == INVALID_EVERY - 1
+
+    lines = [f"hostname: rtr{index:06d}", "interfaces:"]
+    for k in range(INTERFACES):
+        name = f"gi0/{k}" if invalid and k == 0 else f"eth{k}"
+        lines += [
+            f"  - name: {name}",
+            f"    ip: {prefix}.{(third + k) % 256}.1",
+            "    netmask: 255.255.255.0",
+        ]
+    lines += [
+        "",
+        "syslog:",
+        f"  - {prefix}.250.1",
+        f"  - {prefix}.250.2",
+        "",
+        f"dns_servers: {prefix}.251.1",
+        "",
+        "ospf:",
+        "  area: 0",
+        "  networks:",
+        *(f"    - {prefix}.{(third + k) % 256}.0/24" for k in range(INTERFACES)),
+        "",
+        "bgp:",
+        f"  local_as: {65000 + index % 500}",
+        "  neighbors:",
+        f"    - ip: {prefix}.252.2",
+        f"      remote_as: {'650040' if invalid else 65000 + (index + 1) % 500}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def generate_inventory(directory: str | Path, count: int) -> list[Path]:
+    """
+    Write `count` router host_vars files to a directory, returning their paths.
+
+    The inventory is deterministic, so runs against the same count are comparable.
+    Every `INVALID_EVERY`th router fails validation against `examples/schema.yaml`.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = directory / f"rtr{index:06d}.yml"
+        path.write_text(_router(index))
+        paths.append(path)
+    return paths
@@ -0,0 +1,181 @@
+"""Benchmarks of parsing, validation and the CLI, with baseline comparison."""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from src.helpers import load_yaml_or_json, parse_document
+from src.plugins.json_schema.validator import JSONSchemaValidator
+
+ROOT = Path(__file__).parent.parent
+SCHEMA = ROOT / "examples" / "schema.yaml"
+BASELINE = Path(__file__).parent / "baseline.json"
+
+# Inventory sizes benchmarked by default; 10k and 100k are opt-in with `--size`.
+DEFAULT_SIZES = (1000,)
+
+# Budget for the cumulative import time of the CLI module, in microseconds, as
+# reported by `python -X importtime`.
+IMPORT_TIME_BUDGET_US = 200_000
+
+# Fraction by which throughput may drop below the baseline before it is reported
+# as a regression. Wall clock benchmarks are noisy, so this is deliberately loose.
+DEFAULT_THRESHOLD = 0.25
+
+
+def bench_parse(paths: list[Path], documents: list[bytes]) -> float:
+    """Return the seconds spent parsing the documents."""
+    start = time.perf_counter()
+    for path, data in zip(paths, documents, strict=True):
+        parse_document(data, path.suffix)
+    return time.perf_counter() - start
+
+
+def bench_dup_keys(paths: list[Path], documents: list[bytes]) -> float:
+    """Return the seconds spent parsing the documents while checking for duplicate keys."""
+    start = time.perf_counter()
+    for path, data in zip(paths, documents, strict=True):
+        parse_document(data, path.suffix, check_dup_keys=True)
+    return time.perf_counter() - start
+
+
+def bench_validate(paths: list[Path], documents: list[bytes]) -> float:
+    """Return the seconds spent validating the parsed documents, excluding parsing."""
+    validator = JSONSchemaValidator()
+    validator.initialize(validator.prepare_schema(load_yaml_or_json(str(SCHEMA))))
+    elapsed = 0.0
+    for path, data in zip(paths, documents, strict=True):
+        document, _ = parse_document(data, path.suffix)
+        start = time.perf_counter()
+        validator.results(document)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def bench_cli(paths: list[Path], documents: list[bytes]) -> float:
+    """Return the seconds taken by the CLI to validate the inventory, without the cache."""
+    start = time.perf_counter()
+    process = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "src.main",
+            "--document_path",
+            str(paths[0].parent),
+            "--schema",
+            str(SCHEMA),
+            "--no-cache",
+            "--format",
+            "jsonl",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    elapsed = time.perf_counter() - start
+    # The inventory holds invalid documents, so the CLI exits with 1.
+    if process.returncode not in (0, 1):
+        raise RuntimeError(f"net-schema failed: {process.stderr.decode()}")
+    return elapsed
+
+
+BENCHMARKS: dict[str, Callable[[list[Path], list[bytes]], float]] = {
+    "parse": bench_parse,
+    "dup_keys": bench_dup_keys,
+    "validate": bench_validate,
+    "cli": bench_cli,
+}
+
+
+def run(
+    paths: list[Path], names: list[str] | None = None, repeat: int = 3
+) -> dict[str, float]:
+    """
+    Run the benchmarks against an inventory, returning documents per second.
+
+    Each benchmark runs `repeat` times and the fastest run is kept, as the slower
+    runs mostly measure interference from the rest of the system.
+    """
+    documents = [path.read_bytes() for path in paths]
+    throughput = {}
+    for name in names or list(BENCHMARKS):
+        best = min(BENCHMARKS[name](paths, documents) for _ in range(repeat))
+        throughput[name] = len(paths) / best
+    return throughput
+
+
+def import_time(repeat: int = 3) -> int:
+    """Return the cumulative import time of the CLI module in microseconds, at best."""
+    times = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import src.main"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, module = line.split("|")
+            if module.strip() == "src.main":
+                times.append(int(cumulative))
+    return min(times)
+
+
+def environment() -> dict[str, str]:
+    """Return a description of the machine the benchmarks run on."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def load_baseline(path: str | Path = BASELINE) -> dict:
+    """Return the stored baseline, or an empty one if there is none."""
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {"environment": {}, "results": {}}
+
+
+def save_baseline(results: dict[str, dict[str, float]], path: str | Path = BASELINE) -> None:
+    """Store results as the baseline, keeping the sizes that were not run."""
+    baseline = load_baseline(path)
+    baseline["environment"] = environment()
+    baseline["results"].update(
+        {
+            size: {name: round(value, 1) for name, value in throughput.items()}
+            for size, throughput in results.items()
+        }
+    )
+    Path(path).write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[tuple[str, str, float, float | None, bool]]:
+    """
+    Compare results with the baseline.
+
+    Returns a (size, benchmark, throughput, baseline throughput, regressed) tuple per
+    benchmark. A benchmark regressed if its throughput dropped by more than
+    `threshold` of the baseline; those without a baseline never regress.
+    """
+    rows = []
+    for size, throughput in results.items():
+        for name, value in throughput.items():
+            expected = baseline["results"].get(size, {}).get(name)
+            regressed = expected is not None and value < expected * (1 - threshold)
+            rows.append((size, name, value, expected, regressed))
+    return rows
@@ -0,0 +1,179 @@
+"""Validate documents from asyncio code without blocking the event loop."""
+
+import asyncio
+import copy
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar, Union
+
+from src.plugins.json_schema.ip import NetworkIndex
+
+from .cache import DEFAULT_CACHE_MAX_SIZE
+from .helpers import CHUNK_SIZE, batched
+from .main import SchemaValidator, _validate_bytes, _validate_file
+from .results import DocumentResult
+
+if TYPE_CHECKING:
+    from src.plugins.json_schema.validator import JSONSchemaValidator
+
+T = TypeVar("T")
+
+# Default number of worker threads.
+DEFAULT_MAX_WORKERS = 4
+
+
+class AsyncSchemaValidator(SchemaValidator):
+    """
+    Validate documents against a schema from asyncio code.
+
+    Parsing and validation run on a bounded pool of worker threads, each with its own
+    copy of the validator, so the event loop is never blocked by a document. At most
+    `max_pending` documents are queued for the workers at once; further calls wait
+    for a slot, so a burst of requests applies backpressure instead of queueing
+    unbounded work.
+
+    The schema is loaded when the validator is created. Use it as an async context
+    manager, or call `aclose`, to shut the worker threads down.
+    """
+
+    def __init__(
+        self,
+        schema: str,
+        validator: Union["JSONSchemaValidator"],
+        document_path: str | Iterable[str] = (),
+        check_dup_keys: bool = False,
+        cache_dir: str | None = None,
+        cache_max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        recursive: bool = False,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+        max_file_size: int | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int | None = None,
+    ):
+        """
+        Initialize the AsyncSchemaValidator class.
+
+        See `SchemaValidator` for the shared arguments. `max_workers` sets the number
+        of worker threads and `max_pending` the number of documents queued for them,
+        twice `max_workers` by default.
+        """
+        super().__init__(
+            document_path=document_path,
+            schema=schema,
+            validator=validator,
+            check_dup_keys=check_dup_keys,
+            cache_dir=cache_dir,
+            cache_max_size=cache_max_size,
+            recursive=recursive,
+            include=include,
+            exclude=exclude,
+            max_file_size=max_file_size,
+        )
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="net-schema")
+        self._max_pending = max_pending or 2 * max_workers
+        self._pending = asyncio.Semaphore(self._max_pending)
+        self._local = threading.local()
+
+    def _thread_validator(self) -> "JSONSchemaValidator":
+        """Return the validator of the current worker thread, creating it on first use."""
+        validator = getattr(self._local, "validator", None)
+        if validator is None:
+            validator = copy.copy(self._validator)
+            validator.initialize(self._schema)
+            self._local.validator = validator
+        return validator
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a function on a worker thread once a pending slot is free."""
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    def _validate_document(self, data: Any, suffix: str, filename: str) -> DocumentResult:
+        validator = self._thread_validator()
+        if isinstance(data, str | bytes):
+            data = data.encode() if isinstance(data, str) else data
+            return _validate_bytes(
+                data, filename, suffix, validator, self._check_dup_keys, cache=None
+            )
+        return validator._document_result(filename, data)
+
+    def _validate_path(self, filename: Path) -> DocumentResult:
+        return _validate_file(
+            filename,
+            self._thread_validator(),
+            self._check_dup_keys,
+            self._cache,
+            self._max_file_size,
+        )
+
+    async def validate_document(
+        self, data: Any, suffix: str = ".yaml", filename: str = "<document>"
+    ) -> DocumentResult:
+        """
+        Validate a single document.
+
+        `data` is either the raw text of a YAML or JSON document, parsed according to
+        `suffix`, or an already parsed document. Checks spanning documents (such as
+        `unique_across_documents`) are not applied to a single document.
+        """
+        return await self._run(self._validate_document, data, suffix, filename)
+
+    async def validate_paths(
+        self, paths: Iterable[str | Path] | None = None
+    ) -> list[DocumentResult]:
+        """
+        Validate the documents found under the given paths, or under `document_path`.
+
+        Documents are validated concurrently and their results returned in document
+        order, with the checks spanning documents applied across them. The documents
+        are found as they are validated and at most `max_pending` of them are in
+        flight at once, so large trees are not turned into a task per document.
+        """
+        # Directories are scanned on the worker threads, a chunk of documents at a time.
+        chunks = batched(self._documents(paths), CHUNK_SIZE)
+        pending: deque[asyncio.Task[DocumentResult]] = deque()
+        results: list[DocumentResult] = []
+        # Local to the call, so that concurrent calls check their own documents.
+        network_index = NetworkIndex()
+        unique_index: dict[tuple[str, str], str] = {}
+
+        async def _collect() -> None:
+            result = await pending.popleft()
+            self._check_across_documents(result, network_index, unique_index)
+            results.append(result)
+
+        try:
+            while chunk := await self._run(next, chunks, []):
+                for document in chunk:
+                    pending.append(
+                        asyncio.ensure_future(self._run(self._validate_path, document))
+                    )
+                    if len(pending) >= self._max_pending:
+                        await _collect()
+            while pending:
+                await _collect()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        written = sum(result.cache_written for result in results)
+        if self._cache is not None and written:
+            await self._run(self._cache.evict, written)
+        return results
+
+    async def aclose(self) -> None:
+        """Shut the worker threads down once their current documents are done."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self) -> "AsyncSchemaValidator":
+        """Return the validator."""
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Shut the worker threads down."""
+        await self.aclose()
@@ -0,0 +1,159 @@
+"""On-disk caches of prepared schemas and per-document validation results."""
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CACHE_DIR = ".net_schema_cache"
+DEFAULT_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# Bumped whenever the layout of cache entries changes.
+CACHE_FORMAT = 5
+
+
+@cache
+def _version() -> str:
+    """Return the installed net-schema version."""
+    # Imported here as importlib.metadata is slow to import and only needed once.
+    from importlib import metadata
+
+    try:
+        return metadata.version("net-schema")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class ResultCache:
+    """
+    Cache of validation results keyed by document content.
+
+    Entries are keyed by a hash of the document bytes and suffix together with a namespace
+    covering the net-schema version, the schema and the validation options, so a
+    change to any of them misses the cache. Each entry is a small JSON file;
+    `evict` trims the least recently used entries once the cache grows past
+    `max_size` bytes.
+    """
+
+    json_default: Callable[[Any], Any] | None = str
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_CACHE_DIR,
+        namespace: str = "",
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+    ):
+        """Initialize the ResultCache class."""
+        self._path = Path(path)
+        self._max_size = max_size
+        # Total size of the entries as of the last `evict`, once it has scanned them.
+        self._size: int | None = None
+        self._namespace = hashlib.sha256(
+            f"{_version()}\0{CACHE_FORMAT}\0{namespace}".encode()
+        ).digest()
+
+    def key(self, content: bytes | mmap.mmap, suffix: str = "") -> str:
+        """
+        Return the cache key of a document's contents, which may be memory-mapped.
+
+        The `suffix` of the document is part of the key, as it selects the parser:
+        the same bytes may be valid JSON and a different YAML document.
+        """
+        digest = hashlib.sha256(self._namespace)
+        digest.update(f"{suffix}\0".encode())
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self._path / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached results for a key, or None on a miss."""
+        entry = self._entry(key)
+        try:
+            with open(entry, "rb") as f:
+                results = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return results
+
+    def set(self, key: str, results: dict) -> int:
+        """Store the results for a key, returning the bytes written (0 on failure)."""
+        entry = self._entry(key)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        except OSError:
+            return 0
+
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(results, f, default=self.json_default)
+                size = f.tell()
+            os.replace(tmp, entry)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return 0
+        return size
+
+    def evict(self, written: int | None = None) -> None:
+        """
+        Remove the least recently used entries until the cache fits in max_size.
+
+        The size of the cache is kept between calls: passing the bytes `written`
+        since the last call skips scanning the cache while it still fits.
+        """
+        if written is not None and self._size is not None:
+            self._size += written
+            if self._size <= self._max_size:
+                return
+
+        entries = []
+        total = 0
+        for entry in self._path.glob("??/*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        if total > self._max_size:
+            for _, size, entry in sorted(entries):
+                try:
+                    entry.unlink()
+                except OSError:
+                    continue
+                total -= size
+                if total <= self._max_size:
+                    break
+        self._size = total
+
+
+class SchemaCache(ResultCache):
+    """
+    Cache of prepared schemas keyed by the schema file contents.
+
+    Entries live in a `schemas` directory under the cache path, so they are kept
+    apart from the result entries and never evicted with them. Values must be
+    plain JSON; a schema that does not serialize cleanly is simply not cached.
+    """
+
+    json_default = None
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_DIR, namespace: str = ""):
+        """Initialize the SchemaCache class."""
+        super().__init__(Path(path) / "schemas", namespace)
@@ -0,0 +1,249 @@
+"""Output formats for validation results."""
+
+import json
+from typing import TYPE_CHECKING, TextIO
+from urllib.parse import quote
+from xml.sax.saxutils import escape, quoteattr
+
+from .results import DocumentResult
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+INFORMATION_URI = "https://github.com/packetcoders/net-schema"
+
+
+def results_table(show_header: bool = True, **kwargs) -> "Table":
+    """Return an empty results table."""
+    from rich.table import Table
+
+    table = Table(show_header=show_header, header_style="bold magenta", **kwargs)
+    table.add_column("Result", ratio=1, min_width=6)
+    table.add_column("Filename", ratio=4)
+    table.add_column("Location", ratio=3)
+    table.add_column("Msg", ratio=5)
+    return table
+
+
+def add_result_rows(table: "Table", result: DocumentResult) -> None:
+    """Add a row to the table for each error of a document."""
+    for error in result.errors:
+        if error.error:
+            key = error.key
+            table.add_row(
+                ":cross_mark:",
+                error.filename,
+                "--" if key is None else str(key),
+                error.msg,
+            )
+        else:
+            table.add_row(":white_heavy_check_mark:", error.filename, "--", "--")
+
+
+class Formatter:
+    """
+    Base class of the output formats.
+
+    `add` is called with the results of each document as they arrive and `finish`
+    once all documents are validated. Except for the table, every format writes
+    each document's results as soon as they are added, so output can be piped
+    without buffering and memory use does not grow with the number of documents.
+    """
+
+    def __init__(self, file: TextIO):
+        """Initialize the formatter."""
+        self._file = file
+
+    def add(self, result: DocumentResult) -> None:
+        """Write the results of a document."""
+        raise NotImplementedError
+
+    def finish(self) -> None:
+        """Write anything that follows the results."""
+
+    def _write(self, text: str) -> None:
+        self._file.write(text)
+        self._file.flush()
+
+
+class TableFormatter(Formatter):
+    """
+    Render the results as a table.
+
+    The table is printed once complete, or with `stream` set, as a borderless table
+    per document.
+    """
+
+    def __init__(self, file: TextIO, stream: bool = False, caption: str | None = None):
+        """Initialize the TableFormatter class."""
+        from rich import box
+        from rich.console import Console
+
+        super().__init__(file)
+        self._console = Console(file=file)
+        self._stream = stream
+        self._caption = caption
+        self._table = None if stream else results_table(box=box.HORIZONTALS, caption=caption)
+        self._count = 0
+
+    def add(self, result: DocumentResult) -> None:
+        """Add the results of a document to the table."""
+        if self._table is not None:
+            add_result_rows(self._table, result)
+            return
+
+        # Fixed column ratios keep the columns aligned from one document to the next.
+        table = results_table(show_header=self._count == 0, box=None, expand=True)
+        add_result_rows(table, result)
+        self._console.print(table)
+        self._count += 1
+
+    def finish(self) -> None:
+        """Print the table, or the caption when streaming."""
+        if self._table is not None:
+            self._console.print(self._table)
+        elif self._caption:
+            self._console.print(self._caption, justify="center", style="dim")
+
+
+class JSONLinesFormatter(Formatter):
+    """Write a line of JSON per document, with its filename, validity and errors."""
+
+    def add(self, result: DocumentResult) -> None:
+        """Write the results of a document as a line of JSON."""
+        line = {
+            "filename": result.filename,
+            "valid": result.valid,
+            "errors": [error.to_dict() for error in result.errors if error.error],
+        }
+        self._write(json.dumps(line, default=str) + "\n")
+
+
+class SarifFormatter(Formatter):
+    """
+    Write a SARIF 2.1.0 log, with a result per error.
+
+    Results are written into the log's `results` array as they arrive; the array
+    and the log are closed by `finish`.
+    """
+
+    def __init__(self, file: TextIO):
+        """Initialize the SarifFormatter class."""
+        super().__init__(file)
+        self._started = False
+        self._separator = ""
+
+    def _start(self) -> None:
+        log = {
+            "version": "2.1.0",
+            "$schema": SARIF_SCHEMA,
+            "runs": [
+                {
+                    "tool": {
+                        "driver": {
+                            "name": "net-schema",
+                            "informationUri": INFORMATION_URI,
+                            "rules": [
+                                {
+                                    "id": "schema",
+                                    "shortDescription": {
+                                        "text": "Document does not match the schema"
+                                    },
+                                }
+                            ],
+                        }
+                    },
+                    "results": [],
+                }
+            ],
+        }
+        # Write the log up to the open results array.
+        header = json.dumps(log)
+        self._write(header[: header.rindex("[]") + 1] + "\n")
+        self._started = True
+
+    def add(self, result: DocumentResult) -> None:
+        """Write a SARIF result for each error of a document."""
+        if not self._started:
+            self._start()
+
+        for error in result.errors:
+            if not error.error:
+                continue
+            location: dict = {
+                "physicalLocation": {"artifactLocation": {"uri": quote(result.filename)}}
+            }
+            if error.key is not None:
+                location["logicalLocations"] = [{"fullyQualifiedName": str(error.key)}]
+            sarif_result = {
+                "ruleId": "schema",
+                "level": "error",
+                "message": {"text": error.msg},
+                "locations": [location],
+            }
+            self._write(self._separator + json.dumps(sarif_result, default=str))
+            self._separator = ",\n"
+
+    def finish(self) -> None:
+        """Close the results array and the log."""
+        if not self._started:
+            self._start()
+        self._write("\n]}]}\n")
+
+
+class JUnitFormatter(Formatter):
+    """
+    Write a JUnit XML report, with a test case per document.
+
+    As the report is written incrementally, the test suite carries no totals;
+    they are left to the consumer to count.
+    """
+
+    def __init__(self, file: TextIO):
+        """Initialize the JUnitFormatter class."""
+        super().__init__(file)
+        self._started = False
+
+    def _start(self) -> None:
+        self._write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<testsuites name="net-schema">\n'
+            '<testsuite name="net-schema">\n'
+        )
+        self._started = True
+
+    def add(self, result: DocumentResult) -> None:
+        """Write a test case for a document, failed if it has errors."""
+        if not self._started:
+            self._start()
+
+        testcase = f'<testcase classname="net-schema" name={quoteattr(result.filename)}'
+        errors = [error for error in result.errors if error.error]
+        if not errors:
+            self._write(testcase + "/>\n")
+            return
+
+        details = "\n".join(
+            f"{error.msg}" if error.key is None else f"{error.key}: {error.msg}"
+            for error in errors
+        )
+        message = f"{len(errors)} error{'s' if len(errors) > 1 else ''}"
+        self._write(
+            f'{testcase}><failure message={quoteattr(message)} type="schema">'
+            f"{escape(details)}</failure></testcase>\n"
+        )
+
+    def finish(self) -> None:
+        """Close the test suite."""
+        if not self._started:
+            self._start()
+        self._write("</testsuite>\n</testsuites>\n")
+
+
+# Formats selectable with `--format`, other than the table.
+FORMATTERS: dict[str, type[Formatter]] = {
+    "jsonl": JSONLinesFormatter,
+    "sarif": SarifFormatter,
+    "junit": JUnitFormatter,
+}
@@ -1,9 +1,47 @@
+import errno
 import json
+import mmap
+import os
+import re
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from itertools import islice
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, Any, Union
 
 import yaml
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+
+    YAML_BACKEND = "libyaml"
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+    YAML_BACKEND = "pyyaml"
+
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    JSON_BACKEND = "json"
+
+
+DEFAULT_INCLUDE = ["*.yaml", "*.yml", "*.json"]
+
+# Documents of at least this many bytes are memory-mapped rather than read.
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# Multipliers of the size suffixes accepted by `parse_size`.
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
 
 class DuplicateKeyError(ValueError):
     """Custom exception for duplicate keys."""
@@ -14,7 +52,7 @@ class DuplicateKeyError(ValueError):
         self.key = key
 
 
-class SafeCustomYamlLoader(yaml.SafeLoader):
+class SafeCustomYamlLoader(_SafeLoader):
     """Custom YAML loader to check for duplicate keys."""
 
     def construct_mapping(self, node, deep=False):
@@ -39,6 +77,55 @@ def json_object_pairs_hook(pairs):
     return result
 
 
+class DuplicateKeyTrackingYamlLoader(_SafeLoader):
+    """YAML loader that records duplicate keys while constructing mappings."""
+
+    def __init__(self, stream):
+        """Initialize the loader."""
+        super().__init__(stream)
+        self.duplicate_keys: list = []
+
+    def construct_mapping(self, node, deep=False):
+        """Construct a mapping, recording any duplicate keys."""
+        if isinstance(node, yaml.MappingNode):
+            seen: set = set()
+            for key_node, _ in node.value:
+                if key_node.tag == "tag:yaml.org,2002:merge":
+                    continue
+                key = self.construct_object(key_node, deep=deep)
+                if not isinstance(key, Hashable):
+                    continue
+                if key in seen:
+                    self.duplicate_keys.append(key)
+                seen.add(key)
+        return super().construct_mapping(node, deep=deep)
+
+
+def _safe_load_yaml(data) -> Any:
+    """Parse YAML with the fastest available safe loader."""
+    return yaml.load(data, Loader=_SafeLoader)
+
+
+def _load_json(data) -> Any:
+    """
+    Parse JSON with the fastest available backend.
+
+    Documents orjson rejects but the standard library accepts (e.g. `NaN` or
+    integers wider than 64 bits) are handed to the `json` module. Memory-mapped
+    documents are parsed in place by orjson; the `json` module needs a copy, which
+    it decodes to text in full before parsing.
+    """
+    if orjson is not None:
+        try:
+            if isinstance(data, mmap.mmap):
+                with memoryview(data) as view:
+                    return orjson.loads(view)
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(bytes(data) if isinstance(data, mmap.mmap) else data)
+
+
 def check_for_duplicate_keys(data, file_format):
     """Check for duplicate keys in a JSON or YAML file."""
     try:
@@ -56,12 +143,309 @@ def load_yaml_or_json(filename: str) -> Union[dict, None]:
     if isinstance(filename, str):
         filename_path = Path(filename)
         if filename_path.suffix in [".yaml", ".yml"]:
-            with open(filename_path) as f:
-                return yaml.safe_load(f)
+            with open(filename_path, "rb") as f:
+                return _safe_load_yaml(f)
         elif filename_path.suffix == ".json":
-            with open(filename_path) as f:
-                return json.load(f)
+            with open(filename_path, "rb") as f:
+                return _load_json(f.read())
         else:
             return None
     else:
         raise ValueError("Input should be a string.")
+
+
+def _load_yaml_tracking_duplicates(data: bytes | mmap.mmap) -> tuple[Any, list]:
+    """Parse YAML, returning the document and any duplicate keys."""
+    loader = DuplicateKeyTrackingYamlLoader(data)
+    try:
+        return loader.get_single_data(), loader.duplicate_keys
+    finally:
+        loader.dispose()
+
+
+def _load_json_tracking_duplicates(data: bytes | mmap.mmap) -> tuple[Any, list]:
+    """
+    Parse JSON, returning the document and any duplicate keys.
+
+    This needs the `json` module, so a memory-mapped document is copied and decoded
+    to text in full, whether or not orjson is available.
+    """
+    duplicate_keys: list = []
+
+    def object_pairs_hook(pairs):
+        result = {}
+        for key, value in pairs:
+            if key in result:
+                duplicate_keys.append(key)
+            result[key] = value
+        return result
+
+    if isinstance(data, mmap.mmap):
+        data = bytes(data)
+    return json.loads(data, object_pairs_hook=object_pairs_hook), duplicate_keys
+
+
+def parse_document(
+    data: bytes | mmap.mmap, suffix: str, check_dup_keys: bool = False
+) -> tuple[Any, list]:
+    """
+    Parse the raw contents of a YAML or JSON file.
+
+    Returns the document and the duplicate keys found while parsing it. Duplicate
+    keys are only tracked when `check_dup_keys` is set; as with a plain load, the
+    last occurrence of a duplicated key wins. `data` may be a memory map, as
+    returned by `read_document`; YAML is then read from it as a stream.
+    """
+    if suffix == ".json":
+        if check_dup_keys:
+            return _load_json_tracking_duplicates(data)
+        return _load_json(data), []
+
+    if suffix in [".yaml", ".yml"]:
+        if check_dup_keys:
+            return _load_yaml_tracking_duplicates(data)
+        return _safe_load_yaml(data), []
+
+    return None, []
+
+
+@contextmanager
+def read_document(filename: str | Path) -> Iterator[bytes | mmap.mmap]:
+    """
+    Yield the raw contents of a file, memory-mapped if it is large.
+
+    Files of at least `MMAP_THRESHOLD` bytes are mapped rather than copied into
+    memory, so their pages are read from the page cache as the parser reaches them
+    and can be dropped again under memory pressure. The map is closed on exit.
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # Documents are parsed front to back, once.
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapped
+
+
+def parse_size(size: str) -> int:
+    """Return a size in bytes, given as a number with an optional K, M or G suffix."""
+    match = re.fullmatch(r"\s*(\d+)\s*(?:([KMG])i?)?B?\s*", size, re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"Invalid size {size!r}, expected e.g. 4096, 512K, 100M or 2G")
+    return int(match[1]) * SIZE_UNITS[(match[2] or "").upper()]
+
+
+def load_document(filename: str | Path, check_dup_keys: bool = False) -> tuple[Any, list]:
+    """
+    Load a YAML or JSON file with a single read and a single parse.
+
+    See `parse_document` for the return value.
+    """
+    filename_path = Path(filename)
+
+    if filename_path.suffix not in [".yaml", ".yml", ".json"]:
+        return None, []
+
+    with read_document(filename_path) as data:
+        return parse_document(data, filename_path.suffix, check_dup_keys)
+
+
+def _matches(relative_path: str, patterns: Iterable[str]) -> bool:
+    """
+    Match a path against glob patterns.
+
+    Patterns containing a `/` are matched against the path relative to the search
+    root, other patterns against the final path component only.
+    """
+    name = relative_path.rsplit("/", 1)[-1]
+    return any(fnmatch(relative_path if "/" in p else name, p) for p in patterns)
+
+
+def resolve_prune(prune: Iterable[str | Path] | None) -> set[str]:
+    """Return the resolved paths of directories to prune from a scan."""
+    return {os.path.realpath(directory) for directory in prune or ()}
+
+
+def is_pruned(directory: str, prune: set[str]) -> bool:
+    """Return whether a directory is one of the resolved `prune` directories."""
+    return bool(prune) and os.path.realpath(directory) in prune
+
+
+def _scan_directory(
+    root: str,
+    relative: str,
+    recursive: bool,
+    include: list[str],
+    exclude: list[str],
+    prune: set[str],
+) -> Iterator[Path]:
+    """Yield matching files below a directory, sorted by path."""
+    directory = os.path.join(root, relative) if relative else root
+    with os.scandir(directory) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+
+    for entry in entries:
+        entry_relative = f"{relative}/{entry.name}" if relative else entry.name
+        if _matches(entry_relative, exclude):
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            if recursive and not is_pruned(entry.path, prune):
+                yield from _scan_directory(
+                    root, entry_relative, recursive, include, exclude, prune
+                )
+        elif _matches(entry_relative, include):
+            yield Path(entry.path)
+
+
+def iter_documents(
+    paths: str | Path | Iterable[str | Path],
+    recursive: bool = False,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    missing_ok: bool = False,
+    prune: Iterable[str | Path] | None = None,
+) -> Iterator[Path]:
+    """
+    Lazily yield the documents found under one or more paths.
+
+    Directories are scanned with `os.scandir`, one directory at a time, so the full
+    file list is never built up front. Files are yielded in path order within each
+    directory and only descend into subdirectories when `recursive` is set.
+    Files must match one of the `include` globs (YAML and JSON by default) and
+    files or directories matching an `exclude` glob are skipped, as are the `prune`
+    directories (such as the cache directory) wherever they are found.
+
+    A path that does not exist raises FileNotFoundError, so that a mistyped path is
+    not mistaken for an empty one, unless `missing_ok` is set.
+    """
+    if isinstance(paths, str | Path):
+        paths = [paths]
+    include = list(include) if include else DEFAULT_INCLUDE
+    exclude = list(exclude) if exclude else []
+    pruned = resolve_prune(prune)
+
+    for path in paths:
+        path = str(path)
+        if os.path.isdir(path):
+            yield from _scan_directory(path, "", recursive, include, exclude, pruned)
+        elif not os.path.exists(path):
+            if not missing_ok:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        else:
+            name = os.path.basename(path)
+            if _matches(name, include) and not _matches(name, exclude):
+                yield Path(path)
+
+
+def match_document(
+    path: str | Path,
+    paths: str | Path | Iterable[str | Path],
+    recursive: bool = False,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    prune: Iterable[str | Path] | None = None,
+) -> Path | None:
+    """
+    Return `path` as `iter_documents` would yield it for `paths`, or None if it would not.
+
+    Only the path is matched, so a deleted document still matches: use it to tell
+    whether a changed file is one of the documents without scanning for them.
+    """
+    if isinstance(paths, str | Path):
+        paths = [paths]
+    include = list(include) if include else DEFAULT_INCLUDE
+    exclude = list(exclude) if exclude else []
+    pruned = resolve_prune(prune)
+    target = os.path.abspath(path)
+
+    for root in paths:
+        root = str(root)
+        if not os.path.isdir(root):
+            name = os.path.basename(root)
+            if (
+                os.path.abspath(root) == target
+                and _matches(name, include)
+                and not _matches(name, exclude)
+            ):
+                return Path(root)
+            continue
+
+        relative = Path(os.path.relpath(target, os.path.abspath(root))).as_posix()
+        parts = relative.split("/")
+        if relative == "." or parts[0] == os.pardir or (len(parts) > 1 and not recursive):
+            continue
+        directories = ["/".join(parts[:i]) for i in range(1, len(parts))]
+        if any(
+            _matches(directory, exclude) or is_pruned(os.path.join(root, directory), pruned)
+            for directory in directories
+        ):
+            continue
+        if _matches(relative, include) and not _matches(relative, exclude):
+            return Path(root, relative)
+    return None
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most `size` items."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def imap_ordered(
+    executor: "Executor", func: Callable, iterable: Iterable, window: int
+) -> Iterator[Any]:
+    """
+    Map `func` over `iterable` on an executor, yielding results in input order.
+
+    At most `window` calls are in flight at once, so the input is consumed lazily.
+    """
+    pending: deque = deque()
+    for item in iterable:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# Items handed to a worker process per task by `process_map`.
+CHUNK_SIZE = 64
+
+# Function applied to items by the current worker process, set by `_init_process`.
+_worker: dict = {}
+
+
+def _init_process(initializer: Callable[..., Callable], initargs: tuple) -> None:
+    """Set up a worker process of `process_map`."""
+    _worker["func"] = initializer(*initargs)
+
+
+def _map_chunk(chunk: list) -> list:
+    """Apply the function of the worker process to a chunk of items."""
+    func = _worker["func"]
+    return [func(item) for item in chunk]
+
+
+def process_map(
+    initializer: Callable[..., Callable], initargs: tuple, iterable: Iterable, jobs: int
+) -> Iterator[Any]:
+    """
+    Map a function over `iterable` on `jobs` worker processes, yielding results in order.
+
+    Each worker calls `initializer(*initargs)` once, to set up state such as a
+    compiled validator, and applies the function it returns to each item. Items are
+    sent to the workers in chunks of CHUNK_SIZE and consumed lazily, with at most
+    two chunks per worker in flight. The initializer, its arguments and the items
+    must be picklable.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_process, initargs=(initializer, initargs)
+    ) as executor:
+        chunks = batched(iterable, CHUNK_SIZE)
+        for results in imap_ordered(executor, _map_chunk, chunks, window=jobs * 2):
+            yield from results
@@ -1,21 +1,191 @@
 #! /usr/bin/env python
 
+import json
+import mmap
+import os
 import pathlib
+import signal
 import sys
+import time
 from pathlib import Path
 
 sys.path.append(str(pathlib.Path(__file__).parent.parent.absolute()))
 
-from typing import Union
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from typing import TYPE_CHECKING, Any, Union
 
 import click
-from rich import box
-from rich.console import Console
-from rich.table import Table
+import yaml
 
-from src.plugins.json_schema.validator import JSONSchemaValidator
+from .cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_SIZE, ResultCache, SchemaCache
+from .helpers import (
+    JSON_BACKEND,
+    YAML_BACKEND,
+    iter_documents,
+    load_yaml_or_json,
+    match_document,
+    parse_document,
+    parse_size,
+    process_map,
+    read_document,
+)
+from .profiling import DEFAULT_SLOWEST, Profile
+from .results import DocumentResult, ValidationResult
+
+# jsonschema, rich and the validator plugins are slow to import, so they are imported
+# where they are first used to keep `--help` and argument errors fast.
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from src.plugins.json_schema.ip import NetworkIndex
+    from src.plugins.json_schema.validator import JSONSchemaValidator
+
+
+def _validate_file(
+    filename: Path,
+    validator: Union["JSONSchemaValidator"],
+    check_dup_keys: bool,
+    cache: ResultCache | None,
+    max_file_size: int | None = None,
+    trace_memory: bool = False,
+) -> DocumentResult:
+    """
+    Validate a single document.
+
+    Files larger than `max_file_size` bytes are reported as an error without being
+    read. With `trace_memory` set, and tracemalloc tracing, the peak memory
+    allocated while loading and validating the document is recorded in the result.
+    """
+    if max_file_size is not None:
+        size = filename.stat().st_size
+        if size > max_file_size:
+            return DocumentResult(
+                filename=str(filename),
+                errors=[
+                    ValidationResult(
+                        error=True,
+                        msg=f"File size of {size} bytes exceeds the maximum of "
+                        f"{max_file_size} bytes",
+                        filename=str(filename),
+                    )
+                ],
+            )
+
+    if trace_memory:
+        import tracemalloc
+
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    try:
+        with read_document(filename) as data:
+            result = _validate_bytes(
+                data, str(filename), filename.suffix, validator, check_dup_keys, cache
+            )
+    except (yaml.YAMLError, ValueError) as e:
+        # Name the document, as the parser errors only give a position within it.
+        raise ValueError(f"{filename}: {e}") from e
+
+    if trace_memory:
+        result.peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+    return result
+
+
+def _validate_bytes(
+    data: bytes | mmap.mmap,
+    filename: str,
+    suffix: str,
+    validator: Union["JSONSchemaValidator"],
+    check_dup_keys: bool,
+    cache: ResultCache | None,
+) -> DocumentResult:
+    """Validate the raw contents of a document, parsed according to its suffix."""
+    if cache is not None:
+        cache_key = cache.key(data, suffix)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return DocumentResult(
+                filename=filename,
+                errors=[
+                    ValidationResult.from_dict({**e, "filename": filename})
+                    for e in cached["errors"]
+                ],
+                network_claims=cached["network_claims"],
+                unique_values=cached["unique_values"],
+            )
+
+    # Timings are only taken when profiling.
+    start = time.perf_counter() if validator.profile else 0.0
+    errors: list[ValidationResult] = []
+    loaded_data, duplicate_keys = parse_document(data, suffix, check_dup_keys)
+    parsed = time.perf_counter() if validator.profile else 0.0
+
+    for key in duplicate_keys:
+        errors.append(
+            ValidationResult(error=True, msg=f"Duplicate key found: {key}", location=key)
+        )
 
-from .helpers import check_for_duplicate_keys, load_yaml_or_json
+    errors.extend(validator._validate(loaded_data))
+    network_claims = validator.network_claims
+    unique_values = validator.unique_values
+
+    profile = (
+        {
+            "parse": parsed - start,
+            "validate": time.perf_counter() - parsed,
+            "keywords": validator.keyword_times,
+        }
+        if validator.profile
+        else None
+    )
+
+    cache_written = 0
+    if cache is not None:
+        cache_written = cache.set(
+            cache_key,
+            {
+                "errors": [e.to_dict() for e in errors],
+                "network_claims": network_claims,
+                "unique_values": unique_values,
+            },
+        )
+
+    for e in errors:
+        e.filename = filename
+
+    return DocumentResult(
+        filename=filename,
+        errors=errors,
+        network_claims=network_claims,
+        unique_values=unique_values,
+        profile=profile,
+        cache_written=cache_written,
+    )
+
+
+def _init_worker(
+    validator: Union["JSONSchemaValidator"],
+    schema: dict | None,
+    check_dup_keys: bool,
+    cache: ResultCache | None,
+    max_file_size: int | None,
+    trace_memory: bool,
+) -> Callable[[Path], DocumentResult]:
+    """Initialize the validator once per worker process, returning its `_validate_file`."""
+    validator.initialize(schema)
+    if trace_memory:
+        import tracemalloc
+
+        tracemalloc.start()
+    return partial(
+        _validate_file,
+        validator=validator,
+        check_dup_keys=check_dup_keys,
+        cache=cache,
+        max_file_size=max_file_size,
+        trace_memory=trace_memory,
+    )
 
 
 class SchemaValidator:
@@ -23,61 +193,466 @@ class SchemaValidator:
 
     def __init__(
         self,
-        document_path: str,
+        document_path: str | Iterable[str],
         schema: str,
-        validator: Union[JSONSchemaValidator],
+        validator: Union["JSONSchemaValidator"],
         check_dup_keys: bool = False,
+        jobs: int = 1,
+        cache_dir: str | None = None,
+        cache_max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        recursive: bool = False,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+        max_file_size: int | None = None,
+        trace_memory: bool = False,
     ):
-        """Initialize the SchemaValidator class."""
+        """
+        Initialize the SchemaValidator class.
+
+        `document_path` is a directory or file, or a list of them. Directories are
+        searched for files matching the `include` globs (YAML and JSON by default),
+        descending into subdirectories when `recursive` is set and skipping anything
+        matching an `exclude` glob.
+
+        `jobs` sets the number of worker processes used for validation. A value
+        of 0 uses one worker per CPU.
+
+        When `cache_dir` is set, results are cached there by document content and
+        unchanged documents are not revalidated on later runs. The prepared schema
+        is cached there too, keyed by the schema file contents.
+
+        Documents larger than `max_file_size` bytes are reported as an error instead
+        of being loaded; large documents are otherwise memory-mapped rather than
+        read. `trace_memory` records the peak memory of each document with
+        tracemalloc, in `DocumentResult.peak_memory`, at a cost in speed.
+        """
         self._validator = validator
-        self._document_path = Path(document_path)
-        self._schema = load_yaml_or_json(schema)
+        self._document_paths = (
+            [document_path] if isinstance(document_path, str) else list(document_path)
+        )
+        self._recursive = recursive
+        self._include = include
+        self._exclude = exclude
+        self._max_file_size = max_file_size
+        self._trace_memory = trace_memory
+        # The cache may live inside the document tree; its entries are not documents.
+        self._prune = [cache_dir] if cache_dir else []
+        # Seconds spent loading and preparing the schema, when it was not cached.
+        self.schema_load_time: float | None = None
+        self._schema = self._load_schema(schema, cache_dir)
         self._check_dup_keys = check_dup_keys
-        self._errors: list = []
+        self._jobs = jobs or os.cpu_count() or 1
+        self._cache = (
+            ResultCache(cache_dir, namespace=self._cache_namespace(), max_size=cache_max_size)
+            if cache_dir
+            else None
+        )
+        # Bytes added to the cache since it was last trimmed, by this process or the
+        # worker processes; a run answered entirely from the cache skips trimming it.
+        self._cache_written = 0
+        self._results: dict[str, DocumentResult] | None = None
+        # Errors of each memoized document before the checks spanning documents.
+        self._document_errors: dict[str, list[ValidationResult]] = {}
+        self._stale: set[str] = set()
+
+    def _load_schema(self, schema: str, cache_dir: str | None) -> Any:
+        """Load and prepare the schema, reusing a copy prepared by an earlier run."""
+        if not cache_dir:
+            start = time.perf_counter()
+            prepared = self._validator.prepare_schema(load_yaml_or_json(schema))
+            self.schema_load_time = time.perf_counter() - start
+            return prepared
+
+        path = Path(schema)
+        content = path.read_bytes()
+        cache = SchemaCache(
+            cache_dir, namespace=f"{path.suffix}\0{type(self._validator).__name__}"
+        )
+        key = cache.key(content)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached["schema"]
+
+        prepared = self._validator.prepare_schema(parse_document(content, path.suffix)[0])
+        cache.set(key, {"schema": prepared})
+        return prepared
+
+    def _cache_namespace(self) -> str:
+        """Return the part of the cache key shared by every document."""
+        schema = json.dumps(self._schema, sort_keys=True, default=str)
+        return f"{schema}\0{self._check_dup_keys}\0{self._validator.fingerprint()}"
 
     def initialize(self) -> None:
         """Initialize the validator and schema."""
         self._validator.initialize(self._schema)
 
-    def _validate(self) -> dict:
-        """Validates the documents."""
-        for filename in self._document_path.iterdir():
-            if filename.suffix in [".yaml", ".yml", ".json"]:
-                data = filename.read_text()
-
-                if self._check_dup_keys:
-                    valid, error, key = check_for_duplicate_keys(data, filename.suffix[1:])
-                    if not valid:
-                        self._errors.append(
-                            {
-                                "error": True,
-                                "msg": error,
-                                "key": key,
-                                "filename": str(filename),
-                            }
+    def _documents(self, paths: Iterable[str | Path] | None = None) -> Iterator[Path]:
+        """Yield the documents to validate, in a deterministic order."""
+        return iter_documents(
+            self._document_paths if paths is None else paths,
+            recursive=self._recursive,
+            include=self._include,
+            exclude=self._exclude,
+            prune=self._prune,
+        )
+
+    def _iter_file_results(self, documents: Iterable[Path]) -> Iterator[DocumentResult]:
+        """Yield the results of each document, in document order."""
+        if self._jobs == 1:
+            if self._trace_memory:
+                import tracemalloc
+
+                started = not tracemalloc.is_tracing()
+                if started:
+                    tracemalloc.start()
+            try:
+                for filename in documents:
+                    yield _validate_file(
+                        filename,
+                        self._validator,
+                        self._check_dup_keys,
+                        self._cache,
+                        self._max_file_size,
+                        self._trace_memory,
+                    )
+            finally:
+                if self._trace_memory and started:
+                    tracemalloc.stop()
+            return
+
+        yield from process_map(
+            _init_worker,
+            (
+                self._validator,
+                self._schema,
+                self._check_dup_keys,
+                self._cache,
+                self._max_file_size,
+                self._trace_memory,
+            ),
+            documents,
+            self._jobs,
+        )
+
+    def _check_network_overlaps(
+        self, result: DocumentResult, network_index: "NetworkIndex"
+    ) -> list[ValidationResult]:
+        """Return an error for each earlier claimed network a claimed network overlaps."""
+        from src.plugins.json_schema.ip import parse_network
+
+        errors = []
+        for claim in result.network_claims:
+            network = parse_network(claim)
+            if network is None:
+                continue
+            for other, owner in network_index.claim(network, result.filename):
+                errors.append(
+                    ValidationResult(
+                        error=True,
+                        msg=f"'{claim}' overlaps '{other}' in {owner}",
+                        location=claim,
+                        filename=result.filename,
+                    )
+                )
+        return errors
+
+    def _check_unique_values(
+        self, result: DocumentResult, unique_index: dict[tuple[str, str], str]
+    ) -> list[ValidationResult]:
+        """Return an error for each unique value already used by another document."""
+        errors = []
+        for pointer, values in result.unique_values.items():
+            for value in values:
+                owner = unique_index.setdefault((pointer, value), result.filename)
+                if owner != result.filename:
+                    errors.append(
+                        ValidationResult(
+                            error=True,
+                            msg=f"{value} is also used at {pointer} in {owner}",
+                            location=pointer,
+                            filename=result.filename,
                         )
+                    )
+        return errors
+
+    def _check_across_documents(
+        self,
+        result: DocumentResult,
+        network_index: "NetworkIndex",
+        unique_index: dict[tuple[str, str], str],
+    ) -> None:
+        """
+        Add the errors of the checks spanning documents to a document's results.
+
+        The indexes hold the values claimed by the documents checked before it; they
+        belong to a single pass over the documents, so concurrent passes do not mix.
+        """
+        errors = self._check_network_overlaps(
+            result, network_index
+        ) + self._check_unique_values(result, unique_index)
+        if errors:
+            result.errors = [e for e in result.errors if e.error] + errors
+
+    def _evict(self) -> None:
+        """Trim the result cache, if results were added to it since the last trim."""
+        if self._cache is not None and self._cache_written:
+            self._cache.evict(self._cache_written)
+        self._cache_written = 0
+
+    def _iter_results(self, documents: Iterable[Path]) -> Iterator[DocumentResult]:
+        """Validate the given documents, yielding the results of each."""
+        from src.plugins.json_schema.ip import NetworkIndex
+
+        network_index = NetworkIndex()
+        unique_index: dict[tuple[str, str], str] = {}
+        for result in self._iter_file_results(documents):
+            self._cache_written += result.cache_written
+            self._check_across_documents(result, network_index, unique_index)
+            yield result
+
+        self._evict()
+
+    def iter_results(
+        self, paths: Iterable[str | Path] | None = None
+    ) -> Iterator[DocumentResult]:
+        """
+        Validate the documents, yielding the results of each as it completes.
+
+        Results are yielded in document order and are not retained, so memory use
+        does not grow with the number of documents or errors. `paths` validates the
+        documents found under those paths in place of `document_path`.
+        """
+        return self._iter_results(self._documents(paths))
 
-                loaded_data = load_yaml_or_json(str(filename))
-                errors = self._validator._validate(loaded_data)
-                for e in errors:
-                    e.update({"filename": str(filename)})
-                    self._errors.append(e)
+    def _memoize(self, documents: Iterable[Path]) -> dict[str, DocumentResult]:
+        """Validate documents and memoize their results, without the checks spanning them."""
+        assert self._results is not None
+        validated = {}
+        for result in self._iter_file_results(documents):
+            self._cache_written += result.cache_written
+            self._document_errors[result.filename] = list(result.errors)
+            self._results[result.filename] = validated[result.filename] = result
 
-        return {"errors": self._errors}
+        self._evict()
+        return validated
+
+    def _recheck_across_documents(self) -> set[str]:
+        """
+        Apply the checks spanning documents to every memoized document, in order.
+
+        Returns the filenames of the documents whose errors changed.
+        """
+        from src.plugins.json_schema.ip import NetworkIndex
+
+        assert self._results is not None
+        network_index = NetworkIndex()
+        unique_index: dict[tuple[str, str], str] = {}
+        changed = set()
+        for filename, result in self._results.items():
+            errors = result.errors
+            result.errors = list(self._document_errors[filename])
+            self._check_across_documents(result, network_index, unique_index)
+            if result.errors != errors:
+                changed.add(filename)
+        return changed
+
+    def _refresh_stale(self) -> list[DocumentResult]:
+        """Revalidate the documents passed to `invalidate` since the last refresh."""
+        assert self._results is not None
+        stale = sorted(self._stale)
+        self._stale.clear()
+
+        # Only the changed paths `_documents` would yield are documents, named as it
+        # names them; other files, such as the schema, are ignored.
+        documents = {}
+        for filename in stale:
+            document = match_document(
+                filename,
+                self._document_paths,
+                self._recursive,
+                self._include,
+                self._exclude,
+                self._prune,
+            )
+            if document is not None:
+                documents[str(document)] = document
+
+        previous = [self._results[name] for name in documents if name in self._results]
+        # Replacing the results of known documents keeps their place in the results.
+        validated = self._memoize(
+            document for document in documents.values() if document.is_file()
+        )
+        for name in documents:
+            if name not in validated:
+                self._results.pop(name, None)
+                self._document_errors.pop(name, None)
+
+        # Place new documents where they belong in document order.
+        known = {result.filename for result in previous}
+        if any(filename not in known for filename in validated):
+            order = {str(document): i for i, document in enumerate(self._documents())}
+            self._results = dict(
+                sorted(self._results.items(), key=lambda item: order.get(item[0], len(order)))
+            )
+
+        changed = set(validated)
+        # Only documents with values checked across documents can affect the others.
+        if any(r.network_claims or r.unique_values for r in [*previous, *validated.values()]):
+            changed |= self._recheck_across_documents()
+        return [result for filename, result in self._results.items() if filename in changed]
+
+    def refresh(self) -> list[DocumentResult]:
+        """
+        Bring the memoized results up to date, returning the results that changed.
+
+        Validates every document on the first call; later calls revalidate just the
+        documents passed to `invalidate`, then recheck the checks spanning documents
+        if the changed documents take part in them. The results are the same as
+        those of `revalidate`.
+        """
+        if self._results is None:
+            self._results = {}
+            self._document_errors = {}
+            try:
+                self._memoize(self._documents())
+            except BaseException:
+                # Validate every document again on the next call, not just the stale ones.
+                self._results = None
+                raise
+            self._recheck_across_documents()
+            return list(self._results.values())
+        return self._refresh_stale() if self._stale else []
 
     @property
     def results(self) -> dict:
-        """Return the validation results."""
-        return self._validate()
+        """
+        Return the validation results.
+
+        The documents are validated on first access only; later accesses return the
+        same results, revalidating just the documents passed to `invalidate`.
+        """
+        self.refresh()
+        assert self._results is not None
+        return {
+            "errors": [e.to_dict() for result in self._results.values() for e in result.errors]
+        }
+
+    def invalidate(self, paths: Iterable[str | Path]) -> None:
+        """
+        Mark documents as changed so that the next `results` access revalidates them.
+
+        Paths that no longer exist are dropped from the results; new paths are added.
+        Paths that are not among the documents, as found from `document_path`, are
+        ignored.
+        """
+        if self._results is not None:
+            self._stale.update(str(Path(path)) for path in paths)
+
+    def revalidate(self) -> dict:
+        """Discard the memoized results and validate every document again."""
+        self._results = None
+        self._stale.clear()
+        return self.results
+
+
+def _watch(
+    console: "Console",
+    factory: Callable[[], SchemaValidator],
+    document_path: Iterable[str],
+    schema: str,
+    recursive: bool,
+    include: Iterable[str],
+    exclude: Iterable[str],
+    cache_dir: str,
+) -> None:
+    """Validate the documents, then revalidate those that change until interrupted."""
+    from rich import box
+
+    from .formatters import add_result_rows, results_table
+    from .watch import open_watcher
+
+    schema_validator = factory()
+    # Writes to the cache must not trigger a revalidation.
+    watcher = open_watcher(
+        document_path,
+        files=[schema],
+        recursive=recursive,
+        include=include,
+        exclude=exclude,
+        prune=[cache_dir],
+    )
+    schema_path = str(Path(schema))
+    # The first pass validates every document.
+    changed: set[str] | None = set()
+    # Whether the schema changed and has not been loaded since, e.g. as it was mid-edit.
+    schema_pending = False
+    with watcher:
+        while True:
+            if changed is None or schema_path in changed:
+                schema_pending = True
+            documents = set() if changed is None else changed - {schema_path}
+            try:
+                if schema_pending:
+                    schema_validator = factory()
+                    schema_pending = False
+                else:
+                    schema_validator.invalidate(documents)
+                refreshed = schema_validator.refresh()
+            except Exception as e:
+                # A document or the schema may be mid-edit; report it and try again
+                # on the next change. A new validator validates every document anyway.
+                console.print(f"Error: {e}", style="red")
+                if not schema_pending:
+                    schema_validator.invalidate(documents)
+            else:
+                if refreshed:
+                    table = results_table(box=box.HORIZONTALS)
+                    for result in refreshed:
+                        add_result_rows(table, result)
+                    console.print(table)
+
+                errors = schema_validator.results["errors"]
+                invalid = {e["filename"] for e in errors if e["error"]}
+                total = len({e["filename"] for e in errors})
+                console.print(
+                    f"[{time.strftime('%H:%M:%S')}] {len(invalid)} of {total} documents "
+                    "have errors. Watching for changes...",
+                    style="dim",
+                )
+
+            changed = watcher.wait()
+
+
+def _explicit_options(*names: str) -> list[str]:
+    """Return the flags of the given options that were set on the command line."""
+    from click.core import ParameterSource
+
+    ctx = click.get_current_context()
+    return [
+        param.opts[0]
+        for param in ctx.command.params
+        if param.name in names
+        and ctx.get_parameter_source(param.name) not in (None, ParameterSource.DEFAULT)
+    ]
+
+
+def _size_option(ctx: click.Context, param: click.Parameter, value: str | None) -> int | None:
+    """Convert a size option such as `100M` to bytes."""
+    if value is None:
+        return None
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
 
 
 @click.command()
 @click.option(
     "--document_path",
     "-p",
-    type=click.Path(),
-    required=True,
-    help="Path to the documents directory",
+    type=click.Path(exists=True),
+    multiple=True,
+    help="Path to a documents directory or file (can be repeated)  [required]",
 )
 @click.option(
     "--schema",
@@ -93,41 +668,252 @@ class SchemaValidator:
     is_flag=True,
     help="Check for duplicate keys in JSON or YAML documents",
 )
-def main(document_path: str, schema: str, check_dup_keys: bool):
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Number of worker processes (0 uses one per CPU)",
+)
+@click.option(
+    "--max-errors",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Stop validating a document after this many errors",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    help="Stop validating a document at its first error",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=DEFAULT_CACHE_DIR,
+    show_default=True,
+    help="Directory used to cache results between runs",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Revalidate every document without reading or writing the cache",
+)
+@click.option(
+    "--recursive",
+    "-r",
+    is_flag=True,
+    help="Search document directories recursively",
+)
+@click.option(
+    "--include",
+    multiple=True,
+    help="Glob of documents to validate (can be repeated)  [default: *.yaml, *.yml, *.json]",
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="Glob of documents or directories to skip (can be repeated)",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Print the results of each document as soon as it is validated",
+)
+@click.option(
+    "--serve",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Keep the schema loaded and validate the documents sent to this Unix socket",
+)
+@click.option(
+    "--connect",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Validate the documents with the server listening on this Unix socket",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "jsonl", "sarif", "junit"]),
+    default="table",
+    show_default=True,
+    help="Output format; formats other than table are written as results arrive",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Revalidate documents as they change, until interrupted",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Report parse, validation and keyword timings on stderr (bypasses the cache)",
+)
+@click.option(
+    "--profile-top",
+    type=click.IntRange(min=0),
+    default=DEFAULT_SLOWEST,
+    show_default=True,
+    help="Number of documents listed by --profile and --trace-memory",
+)
+@click.option(
+    "--max-file-size",
+    callback=_size_option,
+    default=None,
+    metavar="SIZE",
+    help="Report documents larger than this (e.g. 100M) as errors without loading them; "
+    "JSON parsed without orjson or with -k is held in memory as text in full",
+)
+@click.option(
+    "--trace-memory",
+    is_flag=True,
+    help="Report the peak memory of each document on stderr (slow; bypasses the cache)",
+)
+def main(
+    document_path: tuple[str, ...],
+    schema: str,
+    check_dup_keys: bool,
+    jobs: int,
+    max_errors: int | None,
+    fail_fast: bool,
+    cache_dir: str,
+    no_cache: bool,
+    recursive: bool,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    stream: bool,
+    serve: str | None,
+    connect: str | None,
+    output_format: str,
+    watch: bool,
+    profile: bool,
+    profile_top: int,
+    max_file_size: int | None,
+    trace_memory: bool,
+):
     """Validate a directory of YAML and JSON files against a schema."""
+    from rich.console import Console
+
+    from .formatters import FORMATTERS, Formatter, TableFormatter
+    from .server import ServerError, ValidationServer, request_results
+
+    if not document_path and not serve:
+        raise click.UsageError("Missing option '--document_path' / '-p'.")
+    for flag, enabled in (("--profile", profile), ("--trace-memory", trace_memory)):
+        if enabled and (serve or connect or watch):
+            raise click.UsageError(
+                f"{flag} cannot be combined with --serve, --connect or --watch."
+            )
+
+    if connect:
+        # The server validates with the options it was started with.
+        server_options = _explicit_options(
+            "schema",
+            "check_dup_keys",
+            "jobs",
+            "max_errors",
+            "fail_fast",
+            "cache_dir",
+            "no_cache",
+            "recursive",
+            "include",
+            "exclude",
+            "max_file_size",
+        )
+        if server_options:
+            raise click.UsageError(
+                f"{', '.join(server_options)} cannot be combined with --connect; "
+                "pass them to --serve instead."
+            )
+    if serve and jobs != 1:
+        # A pool would be started, and the schema prepared in it, for every request.
+        raise click.UsageError("--jobs cannot be combined with --serve.")
+
     console = Console()
+    backends = f"YAML backend: {YAML_BACKEND}, JSON backend: {JSON_BACKEND}"
 
-    table = Table(show_header=True, header_style="bold magenta", box=box.HORIZONTALS)
-    table.add_column("Result")
-    table.add_column("Filename")
-    table.add_column("Location")
-    table.add_column("Msg")
+    def _schema_validator() -> SchemaValidator:
+        from src.plugins.json_schema.validator import JSONSchemaValidator
 
-    schema_validator = SchemaValidator(
-        document_path=document_path,
-        schema=schema,
-        validator=JSONSchemaValidator(),
-        check_dup_keys=check_dup_keys,
-    )
-    schema_validator.initialize()
-    success: bool = True
+        schema_validator = SchemaValidator(
+            document_path=document_path,
+            schema=schema,
+            validator=JSONSchemaValidator(
+                max_errors=max_errors, fail_fast=fail_fast, profile=profile
+            ),
+            check_dup_keys=check_dup_keys,
+            jobs=jobs,
+            # Cached results carry no timings or peak memory, so every document is validated.
+            cache_dir=None if no_cache or profile or trace_memory else cache_dir,
+            recursive=recursive,
+            include=include,
+            exclude=exclude,
+            max_file_size=max_file_size,
+            trace_memory=trace_memory,
+        )
+        schema_validator.initialize()
+        return schema_validator
 
-    validation_results = schema_validator.results
-    errors = sorted(validation_results["errors"], key=lambda x: x["filename"])
-
-    for error in errors:
-        if error.get("error"):
-            success = False
-            table.add_row(
-                ":cross_mark:",
-                error["filename"],
-                error.get("key", "--"),
-                error["msg"],
+    if watch:
+        if serve or connect:
+            raise click.UsageError("--watch cannot be combined with --serve or --connect.")
+        try:
+            _watch(
+                console,
+                _schema_validator,
+                document_path,
+                schema,
+                recursive,
+                include,
+                exclude,
+                cache_dir,
             )
-        else:
-            table.add_row(":white_heavy_check_mark:", error["filename"], "--", "--")
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if serve:
+        try:
+            server = ValidationServer(serve, _schema_validator, watch=[schema])
+        except ServerError as e:
+            raise click.ClickException(str(e))
+        # Shut down cleanly, removing the socket, when stopped by a service manager.
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        with server:
+            console.print(f"Serving on {serve}", style="dim")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return
+
+    schema_load_time = None
+    if connect:
+        results = request_results(connect, document_path)
+    else:
+        schema_validator = _schema_validator()
+        schema_load_time = schema_validator.schema_load_time
+        results = schema_validator.iter_results()
+    formatter: Formatter
+    if output_format == "table":
+        formatter = TableFormatter(sys.stdout, stream=stream, caption=backends)
+    else:
+        formatter = FORMATTERS[output_format](sys.stdout)
+    success: bool = True
+    timings = Profile(profile_top)
+
+    try:
+        for result in results:
+            success = success and result.valid
+            formatter.add(result)
+            timings.add(result)
+    except ServerError as e:
+        raise click.ClickException(str(e))
+    formatter.finish()
 
-    console.print(table)
+    if profile or trace_memory:
+        timings.render(Console(stderr=True), schema_load_time)
 
     if not success:
         sys.exit(1)
@@ -1,4 +1,6 @@
+from bisect import bisect_right
 from collections.abc import Generator
+from functools import lru_cache
 
 from jsonschema.exceptions import ValidationError
 
@@ -6,6 +8,51 @@ ASN_MIN = 0
 ASN_MAX_LEGACY = 65535
 ASN_MAX = 4294967295
 
+# Maximum number of distinct ASN values whose parsed form is memoized.
+ASN_CACHE_SIZE = 4096
+
+# Inclusive ASN ranges of each ASN class. Classes may overlap (0 is both public and
+# reserved).
+ASN_CLASS_RANGES = {
+    "public": [(ASN_MIN, 23455), (23457, 64495), (131072, 4199999999)],
+    "private": [(64512, 65534), (4200000000, 4294967294)],
+    "reserved": [
+        (ASN_MIN, ASN_MIN),
+        (23456, 23456),
+        (ASN_MAX_LEGACY, ASN_MAX_LEGACY),
+        (65552, 131071),
+        (ASN_MAX, ASN_MAX),
+    ],
+    "documentation": [(64496, 64511), (65536, 65551)],
+}
+
+
+def _build_class_table(class_ranges: dict) -> tuple[list[int], list[frozenset]]:
+    """
+    Flatten the class ranges into sorted, non-overlapping intervals.
+
+    Returns the start of each interval and the classes covering it, for lookup with
+    `bisect`. The last interval starts past ASN_MAX and has no classes.
+    """
+    boundaries = {ASN_MIN, ASN_MAX + 1}
+    for ranges in class_ranges.values():
+        for low, high in ranges:
+            boundaries.update((low, high + 1))
+
+    starts = sorted(boundaries)
+    classes = [
+        frozenset(
+            name
+            for name, ranges in class_ranges.items()
+            if any(low <= start <= high for low, high in ranges)
+        )
+        for start in starts
+    ]
+    return starts, classes
+
+
+_CLASS_STARTS, _CLASS_SETS = _build_class_table(ASN_CLASS_RANGES)
+
 
 def asn_to_int(instance) -> int:
     """Converts an ASN in dot notation to its integer representation."""
@@ -41,101 +88,127 @@ def asn_to_int(instance) -> int:
     return int(instance)
 
 
-# Custom ASN Validators
-def asn(validator, value, instance, schema) -> Generator:
-    """Returns True if the ASN is a valid ASN, False otherwise."""
+@lru_cache(maxsize=ASN_CACHE_SIZE, typed=True)
+def _parse_asn(instance: str | int | bool) -> int | None:
     try:
-        asn_int = asn_to_int(instance)
+        return asn_to_int(instance)
+    except ValidationError:
+        return None
+
+
+def parse_asn(instance) -> int | None:
+    """
+    Return the integer value of an ASN, or None if it is not a valid ASN.
 
-        if not (ASN_MIN <= asn_int <= ASN_MAX):
-            yield ValidationError(f"'{instance}' is not a valid ASN.")
+    Results are memoized, so stacking several ASN keywords on one value only parses
+    it once.
+    """
+    if not isinstance(instance, str | int | bool):
+        return None
+    return _parse_asn(instance)
+
+
+def asn_classes(asn_int: int) -> frozenset:
+    """Return the classes (public, private, reserved, documentation) of an ASN."""
+    if asn_int < ASN_MIN:
+        return frozenset()
+    return _CLASS_SETS[bisect_right(_CLASS_STARTS, asn_int) - 1]
 
-    except ValidationError as e:
-        yield e
+
+def _invalid_asn(instance) -> ValidationError:
+    return ValidationError(f"'{instance}' is not a valid ASN.")
+
+
+# Custom ASN Validators
+def asn(validator, value, instance, schema) -> Generator:
+    """Returns True if the ASN is a valid ASN, False otherwise."""
+    asn_int = parse_asn(instance)
+    if asn_int is None or not (ASN_MIN <= asn_int <= ASN_MAX):
+        yield _invalid_asn(instance)
 
 
 def asn_public(validator, value, instance, schema) -> Generator:
     """Returns True if the ASN is a public/global ASN, False otherwise."""
-    try:
-        asn_int = asn_to_int(instance)
-        if not (
-            ASN_MIN <= asn_int <= 23455
-            or 23457 <= asn_int <= 64495
-            or 131072 <= asn_int <= 4199999999
-        ):
-            yield ValidationError(f"'{instance}' is not a public ASN.")
-    except ValidationError as e:
-        yield e
+    asn_int = parse_asn(instance)
+    if asn_int is None:
+        yield _invalid_asn(instance)
+    elif "public" not in asn_classes(asn_int):
+        yield ValidationError(f"'{instance}' is not a public ASN.")
 
 
 def asn_private(validator, value, instance, schema) -> Generator:
     """Returns True if the ASN is a private ASN, False otherwise."""
-    try:
-        asn_int = asn_to_int(instance)
-        if not (64512 <= asn_int <= 65534 or 4200000000 <= asn_int <= 4294967294):
-            yield ValidationError(f"'{instance}' is not a private ASN.")
-    except ValidationError as e:
-        yield e
+    asn_int = parse_asn(instance)
+    if asn_int is None:
+        yield _invalid_asn(instance)
+    elif "private" not in asn_classes(asn_int):
+        yield ValidationError(f"'{instance}' is not a private ASN.")
 
 
 def asn_reserved(validator, value, instance, schema) -> Generator:
     """Returns True if the ASN is a reserved ASN, False otherwise."""
-    try:
-        asn_int = asn_to_int(instance)
-        if not (
-            asn_int in {ASN_MIN, 23456, ASN_MAX_LEGACY}
-            or 65552 <= asn_int <= 131071
-            or asn_int == ASN_MAX
-        ):
-            yield ValidationError(f"'{instance}' is not a reserved ASN.")
-    except ValidationError as e:
-        yield e
+    asn_int = parse_asn(instance)
+    if asn_int is None:
+        yield _invalid_asn(instance)
+    elif "reserved" not in asn_classes(asn_int):
+        yield ValidationError(f"'{instance}' is not a reserved ASN.")
 
 
 def asn_documentation(validator, value, instance, schema) -> Generator:
     """Returns True if the ASN is a documentation ASN, False otherwise."""
-    try:
-        asn_int = asn_to_int(instance)
-        if not (64496 <= asn_int <= 64511 or 65536 <= asn_int <= 65551):
-            yield ValidationError(f"'{instance}' is not a documentation ASN.")
-    except ValidationError as e:
-        yield e
+    asn_int = parse_asn(instance)
+    if asn_int is None:
+        yield _invalid_asn(instance)
+    elif "documentation" not in asn_classes(asn_int):
+        yield ValidationError(f"'{instance}' is not a documentation ASN.")
 
 
 def asn_2byte(validator, value, instance, schema) -> Generator:
     """Returns True if the ASN is a 2-byte ASN, False otherwise."""
-    try:
-        asn_int = asn_to_int(instance)
-        if not (ASN_MIN <= asn_int <= ASN_MAX_LEGACY):
-            yield ValidationError(f"'{instance}' is not a 2-byte ASN.")
-    except ValidationError as e:
-        yield e
+    asn_int = parse_asn(instance)
+    if asn_int is None:
+        yield _invalid_asn(instance)
+    elif not (ASN_MIN <= asn_int <= ASN_MAX_LEGACY):
+        yield ValidationError(f"'{instance}' is not a 2-byte ASN.")
 
 
 def asn_4byte(validator, value, instance, schema) -> Generator:
     """Returns True if the ASN is a 4-byte ASN, False otherwise."""
-    try:
-        asn_int = asn_to_int(instance)
-        if not (ASN_MIN <= asn_int <= ASN_MAX):
-            yield ValidationError(f"'{instance}' is not a 4-byte ASN.")
-    except ValidationError as e:
-        yield e
+    asn_int = parse_asn(instance)
+    if asn_int is None:
+        yield _invalid_asn(instance)
+    elif not (ASN_MIN <= asn_int <= ASN_MAX):
+        yield ValidationError(f"'{instance}' is not a 4-byte ASN.")
 
 
 def asn_notation_dot(validator, value, instance, schema) -> Generator:
     """Returns True if the ASN is a valid ASN in dot notation, False otherwise."""
-    try:
-        asn_int = asn_to_int(instance)
-        if "." in instance and isinstance(asn_int, int):
-            yield ValidationError(f"'{instance}' is not a valid ASN in dot notation.")
-    except ValidationError as e:
-        yield e
+    asn_int = parse_asn(instance)
+    if asn_int is None:
+        yield _invalid_asn(instance)
+    elif "." in instance:
+        yield ValidationError(f"'{instance}' is not a valid ASN in dot notation.")
 
 
 def asn_notation_int(validator, value, instance, schema) -> Generator:
     """Returns True if the ASN is a valid ASN in integer notation, False otherwise."""
-    try:
-        if instance == asn_to_int(instance):
-            yield ValidationError(f"'{instance}' is not a valid ASN in integer notation.")
-    except ValidationError as e:
-        yield e
+    asn_int = parse_asn(instance)
+    if asn_int is None:
+        yield _invalid_asn(instance)
+    elif instance == asn_int:
+        yield ValidationError(f"'{instance}' is not a valid ASN in integer notation.")
+
+
+def asn_class(validator, value, instance, schema) -> Generator:
+    """
+    Check that the ASN belongs to one of the given classes.
+
+    The keyword value is a class name or a list of them, out of public, private,
+    reserved and documentation.
+    """
+    allowed = [value] if isinstance(value, str) else value
+    asn_int = parse_asn(instance)
+    if asn_int is None:
+        yield _invalid_asn(instance)
+    elif asn_classes(asn_int).isdisjoint(allowed):
+        yield ValidationError(f"'{instance}' is not a {' or '.join(allowed)} ASN.")
@@ -1,74 +1,327 @@
 import ipaddress
-from collections.abc import Generator
+from bisect import bisect_left, bisect_right
+from collections.abc import Generator, Iterable
+from contextvars import ContextVar
+from functools import lru_cache
 
 from jsonschema.exceptions import ValidationError
 
+# Maximum number of distinct IP values whose parsed form is memoized.
+IP_CACHE_SIZE = 65536
 
-def ip(validator, value, instance, schema) -> Generator:
-    """Check if the IP address is an IP address."""
+# Networks checked by `ip_no_overlap` in the document being validated. Set by the
+# validator; overlaps between the collected networks are resolved across documents.
+network_claims: ContextVar[list | None] = ContextVar("network_claims", default=None)
+
+# IPv4-mapped IPv6 addresses (::ffff:0:0/96) have this value in their upper 96 bits.
+_IPV4_MAPPED_PREFIX = 0xFFFF
+
+
+class RangeTable:
+    """Sorted, non-overlapping integer ranges supporting O(log n) membership tests."""
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, networks: Iterable, exceptions: Iterable = ()):
+        """Build the table from the networks it covers, minus any exceptions."""
+        ranges = _merge((int(n.network_address), int(n.broadcast_address)) for n in networks)
+        for network in exceptions:
+            ranges = _subtract(
+                ranges, int(network.network_address), int(network.broadcast_address)
+            )
+        self._starts = [start for start, _ in ranges]
+        self._ends = [end for _, end in ranges]
+
+    def __contains__(self, value: int) -> bool:
+        """Return True if the value falls within one of the ranges."""
+        i = bisect_right(self._starts, value) - 1
+        return i >= 0 and value <= self._ends[i]
+
+    def covers(self, low: int, high: int) -> bool:
+        """Return True if the whole range low-high falls within a single range."""
+        i = bisect_right(self._starts, low) - 1
+        return i >= 0 and high <= self._ends[i]
+
+
+class NetworkIndex:
+    """
+    Index of networks, each claimed by an owner.
+
+    Every claim is indexed, including those overlapping earlier claims, so the
+    overlaps found do not depend on the order networks are claimed in. As IP
+    networks are either nested or disjoint, a network overlaps the claims starting
+    within it, found by bisecting the claims sorted by first address, and the claims
+    of its supernets, looked up by each claimed prefix length shorter than its own.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        # Per IP version: first addresses and (network, owner) claims, sorted together.
+        self._entries: dict[int, tuple[list, list]] = {4: ([], []), 6: ([], [])}
+        # Claims by (version, prefix length, network number), for supernet lookups.
+        self._by_prefix: dict[tuple[int, int, int], list] = {}
+        # Prefix lengths claimed per IP version.
+        self._prefixlens: dict[int, set[int]] = {4: set(), 6: set()}
+
+    @staticmethod
+    def _prefix_key(network: ipaddress.IPv4Network | ipaddress.IPv6Network, prefixlen: int):
+        """Return the `_by_prefix` key of a network's supernet with the given prefix."""
+        shift = network.max_prefixlen - prefixlen
+        return network.version, prefixlen, int(network.network_address) >> shift
+
+    def claim(
+        self, network: ipaddress.IPv4Network | ipaddress.IPv6Network, owner
+    ) -> list[tuple]:
+        """
+        Claim a network for an owner.
+
+        Returns the (network, owner) claims it overlaps, supernets first, then the
+        networks within it in address order. The claim is indexed either way.
+        """
+        starts, claims = self._entries[network.version]
+        low, high = int(network.network_address), int(network.broadcast_address)
+
+        overlaps = [
+            other
+            for prefixlen in sorted(self._prefixlens[network.version])
+            if prefixlen < network.prefixlen
+            for other in self._by_prefix.get(self._prefix_key(network, prefixlen), ())
+        ]
+        # Supernets sharing the first address were found above.
+        overlaps += [
+            claim
+            for claim in claims[bisect_left(starts, low) : bisect_right(starts, high)]
+            if claim[0].prefixlen >= network.prefixlen
+        ]
+
+        i = bisect_right(starts, low)
+        starts.insert(i, low)
+        claims.insert(i, (network, owner))
+        self._by_prefix.setdefault(self._prefix_key(network, network.prefixlen), []).append(
+            (network, owner)
+        )
+        self._prefixlens[network.version].add(network.prefixlen)
+        return overlaps
+
+
+def _merge(ranges: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge overlapping or adjacent inclusive ranges."""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract(ranges: list[tuple[int, int]], low: int, high: int) -> list[tuple[int, int]]:
+    """Remove the inclusive range low-high from a list of ranges."""
+    result = []
+    for start, end in ranges:
+        if end < low or start > high:
+            result.append((start, end))
+            continue
+        if start < low:
+            result.append((start, low - 1))
+        if end > high:
+            result.append((high + 1, end))
+    return result
+
+
+def _build_tables() -> dict[int, dict[str, RangeTable]] | None:
+    """
+    Build the classification tables from the networks the stdlib properties use.
+
+    Returns None if this Python's `ipaddress` does not expose them, in which case
+    the stdlib properties are used directly.
+    """
+    try:
+        v4 = ipaddress._IPv4Constants  # type: ignore[attr-defined]
+        v6 = ipaddress._IPv6Constants  # type: ignore[attr-defined]
+        return {
+            4: {
+                "private": RangeTable(
+                    v4._private_networks, getattr(v4, "_private_networks_exceptions", ())
+                ),
+                "reserved": RangeTable([v4._reserved_network]),
+                "multicast": RangeTable([v4._multicast_network]),
+                "link_local": RangeTable([v4._linklocal_network]),
+            },
+            6: {
+                "private": RangeTable(
+                    v6._private_networks, getattr(v6, "_private_networks_exceptions", ())
+                ),
+                "reserved": RangeTable(v6._reserved_networks),
+                "multicast": RangeTable([v6._multicast_network]),
+                "link_local": RangeTable([v6._linklocal_network]),
+            },
+        }
+    except AttributeError:
+        return None
+
+
+_TABLES = _build_tables()
+
+
+@lru_cache(maxsize=IP_CACHE_SIZE, typed=True)
+def _parse_ip(
+    instance: str | int | bytes,
+) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+    try:
+        return ipaddress.ip_address(instance)
+    except ValueError:
+        return None
+
+
+def parse_ip(instance) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+    """Return the IP address of an instance, or None if it is not an IP address."""
+    if not isinstance(instance, str | int | bytes):
+        return None
+    return _parse_ip(instance)
+
+
+@lru_cache(maxsize=IP_CACHE_SIZE, typed=True)
+def _parse_network(
+    instance: str | int | bytes,
+) -> ipaddress.IPv4Network | ipaddress.IPv6Network | None:
     try:
-        ipaddress.ip_address(instance)
+        return ipaddress.ip_network(instance, strict=False)
     except ValueError:
+        return None
+
+
+def parse_network(instance) -> ipaddress.IPv4Network | ipaddress.IPv6Network | None:
+    """
+    Return the IP network of an instance, or None if it is not an IP network.
+
+    Host bits are ignored, so addresses and interfaces (`10.0.0.1/24`) are accepted.
+    """
+    if not isinstance(instance, str | int | bytes):
+        return None
+    return _parse_network(instance)
+
+
+@lru_cache(maxsize=256)
+def _supernet_tables(supernets: tuple) -> dict[int, RangeTable]:
+    """Return a range table per IP version covering the given supernets."""
+    networks = [ipaddress.ip_network(supernet) for supernet in supernets]
+    return {
+        version: RangeTable(n for n in networks if n.version == version) for version in (4, 6)
+    }
+
+
+def ip_is(address: ipaddress.IPv4Address | ipaddress.IPv6Address, category: str) -> bool:
+    """
+    Return True if the address is in a category (private, reserved, multicast, link_local).
+
+    Gives the same answer as the matching `ipaddress` property (e.g. `is_private`)
+    using a bisect lookup on the address's integer value. IPv4-mapped IPv6 addresses,
+    which the stdlib classifies differently between Python versions, are handed to
+    the property itself.
+    """
+    value = int(address)
+    if _TABLES is None or (address.version == 6 and value >> 32 == _IPV4_MAPPED_PREFIX):
+        return getattr(address, f"is_{category}")
+    return value in _TABLES[address.version][category]
+
+
+def ip(validator, value, instance, schema) -> Generator:
+    """Check if the IP address is an IP address."""
+    if parse_ip(instance) is None:
         yield ValidationError(f"'{instance}' is not a valid IP address.")
 
 
 def ip_ipv4(validator, value, instance, schema) -> Generator:
     """Check if the IP address is an IPv4 address."""
-    try:
-        if not isinstance(ipaddress.ip_address(instance), ipaddress.IPv4Address):
-            yield ValidationError(f"'{instance}' is not an IPv4 address.")
-    except ValueError:
+    address = parse_ip(instance)
+    if address is None:
         yield ValidationError(f"'{instance}' is not a valid IP address.")
+    elif address.version != 4:
+        yield ValidationError(f"'{instance}' is not an IPv4 address.")
 
 
 def ip_ipv6(validator, value, instance, schema) -> Generator:
     """Check if the IP address is an IPv6 address."""
-    try:
-        if not isinstance(ipaddress.ip_address(instance), ipaddress.IPv6Address):
-            yield ValidationError(f"'{instance}' is not an IPv6 address.")
-    except ValueError:
+    address = parse_ip(instance)
+    if address is None:
         yield ValidationError(f"'{instance}' is not a valid IP address.")
+    elif address.version != 6:
+        yield ValidationError(f"'{instance}' is not an IPv6 address.")
 
 
 def ip_multicast(validator, value, instance, schema) -> Generator:
     """Check if the IP address is a multicast address."""
-    try:
-        if not ipaddress.ip_address(instance).is_multicast:
-            yield ValidationError(f"'{instance}' is not a multicast IP address.")
-    except ValueError:
+    address = parse_ip(instance)
+    if address is None:
         yield ValidationError(f"'{instance}' is not a valid IP address.")
+    elif not ip_is(address, "multicast"):
+        yield ValidationError(f"'{instance}' is not a multicast IP address.")
 
 
 def ip_private(validator, value, instance, schema) -> Generator:
     """Check if the IP address is a private address."""
-    try:
-        if not ipaddress.ip_address(instance).is_private:
-            yield ValidationError(f"'{instance}' is not a private IP address.")
-    except ValueError:
+    address = parse_ip(instance)
+    if address is None:
         yield ValidationError(f"'{instance}' is not a valid IP address.")
+    elif not ip_is(address, "private"):
+        yield ValidationError(f"'{instance}' is not a private IP address.")
 
 
 def ip_reserved(validator, value, instance, schema) -> Generator:
     """Check if the IP address is a reserved address."""
-    try:
-        if not ipaddress.ip_address(instance).is_reserved:
-            yield ValidationError(f"'{instance}' is not a reserved IP address.")
-    except ValueError:
+    address = parse_ip(instance)
+    if address is None:
         yield ValidationError(f"'{instance}' is not a valid IP address.")
+    elif not ip_is(address, "reserved"):
+        yield ValidationError(f"'{instance}' is not a reserved IP address.")
 
 
 def ip_linklocal(validator, value, instance, schema) -> Generator:
     """Check if the IP address is a link-local address."""
-    try:
-        if not ipaddress.ip_address(instance).is_link_local:
-            yield ValidationError(f"'{instance}' is not a link-local IP address.")
-    except ValueError:
+    address = parse_ip(instance)
+    if address is None:
         yield ValidationError(f"'{instance}' is not a valid IP address.")
+    elif not ip_is(address, "link_local"):
+        yield ValidationError(f"'{instance}' is not a link-local IP address.")
 
 
 def ip_network(validator, value, instance, schema) -> Generator:
     """Check if the IP address is a network."""
-    try:
-        ipaddress.ip_network(instance, strict=False)
-    except ValueError:
+    if parse_network(instance) is None:
+        yield ValidationError(f"'{instance}' is not a valid IP network.")
+
+
+def ip_within(validator, value, instance, schema) -> Generator:
+    """
+    Check if the IP address or network falls within one of the given supernets.
+
+    The keyword value is a list of supernets, e.g. `["10.0.0.0/8", "2001:db8::/32"]`.
+    """
+    network = parse_network(instance)
+    if network is None:
         yield ValidationError(f"'{instance}' is not a valid IP network.")
+        return
+
+    supernets = tuple(value) if isinstance(value, list) else (value,)
+    table = _supernet_tables(supernets)[network.version]
+    if not table.covers(int(network.network_address), int(network.broadcast_address)):
+        yield ValidationError(f"'{instance}' is not within {', '.join(supernets)}.")
+
+
+def ip_no_overlap(validator, value, instance, schema) -> Generator:
+    """
+    Check if the IP network does not overlap any other network using this keyword.
+
+    Overlaps are checked across every document validated in a run, by the
+    `SchemaValidator` driving the validation; on its own the keyword only checks
+    that the instance is a network.
+    """
+    network = parse_network(instance)
+    if network is None:
+        yield ValidationError(f"'{instance}' is not a valid IP network.")
+        return
+
+    claims = network_claims.get()
+    if claims is not None:
+        claims.append(str(instance))
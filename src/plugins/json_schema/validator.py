@@ -1,8 +1,14 @@
-import logging
+import json
+import os
 import sys
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache, wraps
+from itertools import islice
 from pathlib import Path
+from time import perf_counter
+from typing import Any
 
-from jsonschema import Draft7Validator, FormatChecker, exceptions
+from jsonschema import Draft7Validator, FormatChecker, exceptions, validators
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
@@ -10,6 +16,7 @@ from plugins.json_schema.asn import (
     asn,
     asn_2byte,
     asn_4byte,
+    asn_class,
     asn_documentation,
     asn_notation_dot,
     asn_notation_int,
@@ -18,13 +25,15 @@ from plugins.json_schema.asn import (
     asn_reserved,
 )
 from plugins.json_schema.ip import ip
-from plugins.json_schema.vlan import vlan, vlan_extended, vlan_standard
+from plugins.json_schema.vlan import vlan, vlan_extended, vlan_items, vlan_standard
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    filename="net_schema.log",
-)
+try:
+    from ...helpers import process_map
+    from ...results import DocumentResult, ValidationResult
+except ImportError:
+    # Imported as the top-level `plugins` package rather than through `src`.
+    from helpers import process_map  # type: ignore[no-redef]
+    from results import DocumentResult, ValidationResult  # type: ignore[no-redef]
 
 
 DEFAULT_ID = "http://packetcoders.io/schemas/main"
@@ -36,8 +45,11 @@ from plugins.json_schema.ip import (
     ip_linklocal,
     ip_multicast,
     ip_network,
+    ip_no_overlap,
     ip_private,
     ip_reserved,
+    ip_within,
+    network_claims,
 )
 
 ASN_VALIDATORS = {
@@ -50,6 +62,7 @@ ASN_VALIDATORS = {
     "asn": asn,
     "asn_dot-notation": asn_notation_dot,
     "asn_int-notation": asn_notation_int,
+    "asn_class": asn_class,
 }
 
 IP_VALIDATORS = {
@@ -61,63 +74,326 @@ IP_VALIDATORS = {
     "ip_reserved": ip_reserved,
     "ip_linklocal": ip_linklocal,
     "ip_network": ip_network,
+    "ip_within": ip_within,
+    "ip_no_overlap": ip_no_overlap,
 }
 
 VLAN_VALIDATORS = {
     "vlan": vlan,
     "vlan-standard": vlan_standard,
     "vlan-extended": vlan_extended,
+    # Batches arrays of VLAN IDs and defers to the standard keyword otherwise.
+    "items": vlan_items,
 }
 
 VALIDATORS = {**ASN_VALIDATORS, **IP_VALIDATORS, **VLAN_VALIDATORS}
 
 
+@cache
+def _validator_class(keywords: tuple[tuple[str, Callable], ...]) -> type:
+    """
+    Return a Draft 7 validator class extended with the given keywords.
+
+    Classes are built once per set of keywords and shared, leaving
+    `Draft7Validator` itself untouched.
+    """
+    return validators.extend(Draft7Validator, dict(keywords))
+
+
+def _timed_keyword(owner: "JSONSchemaValidator", name: str, func: Callable) -> Callable:
+    """
+    Wrap a keyword callable to count its calls and time in `owner.keyword_times`.
+
+    Time spent in nested keywords (e.g. below `properties` or `$ref`) is included;
+    time the caller spends between the errors a keyword yields is not.
+    """
+
+    @wraps(func)
+    def _keyword(validator, value, instance, schema):
+        counters = owner.keyword_times.setdefault(name, [0, 0.0])
+        counters[0] += 1
+        running = True
+        start = perf_counter()
+        try:
+            for error in func(validator, value, instance, schema) or ():
+                counters[1] += perf_counter() - start
+                running = False
+                yield error
+                running = True
+                start = perf_counter()
+        finally:
+            if running:
+                counters[1] += perf_counter() - start
+
+    return _keyword
+
+
+def _init_worker(
+    validator: "JSONSchemaValidator", schema: dict | None
+) -> Callable[[tuple[str, Any]], DocumentResult]:
+    """Initialize the validator once per worker process, returning its document validation."""
+    validator.initialize(schema)
+    return lambda document: validator._document_result(*document)
+
+
+# Top-level schema keyword listing JSON pointers whose values must be unique across
+# all documents. A `*` segment matches every item of an array or object.
+UNIQUE_KEYWORD = "unique_across_documents"
+
+
+def _resolve_pointer(data, parts: list[str]) -> Iterator:
+    """Yield the values at a split JSON pointer, expanding `*` segments."""
+    if not parts:
+        yield data
+        return
+
+    part, rest = parts[0], parts[1:]
+    if part == "*":
+        if isinstance(data, dict | list):
+            for child in data.values() if isinstance(data, dict) else data:
+                yield from _resolve_pointer(child, rest)
+    elif isinstance(data, dict):
+        if part in data:
+            yield from _resolve_pointer(data[part], rest)
+    elif isinstance(data, list):
+        if part.isdigit() and int(part) < len(data):
+            yield from _resolve_pointer(data[int(part)], rest)
+
+
+def _split_pointer(pointer: str) -> list[str]:
+    """Split a JSON pointer into its unescaped reference tokens."""
+    if not pointer:
+        return []
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer.split("/")[1:]]
+
+
+def _has_nested_id(schema, root: bool = True) -> bool:
+    """Return True if a subschema sets `$id`, changing the base of its references."""
+    if isinstance(schema, dict):
+        if not root and "$id" in schema:
+            return True
+        return any(_has_nested_id(value, root=False) for value in schema.values())
+    if isinstance(schema, list):
+        return any(_has_nested_id(value, root=False) for value in schema)
+    return False
+
+
+# Keywords whose values are instance data rather than subschemas; a `$ref` in them is
+# a literal value.
+_INSTANCE_KEYWORDS = frozenset({"const", "enum", "default", "examples"})
+
+# Keywords whose values map arbitrary names, which may match keywords, to subschemas.
+_SCHEMA_MAP_KEYWORDS = frozenset(
+    {"properties", "patternProperties", "definitions", "dependencies"}
+)
+
+
+def dereference(schema):
+    """
+    Return a copy of a schema with its local `$ref`s replaced by what they point to.
+
+    Under Draft 7 a `$ref` ignores its sibling keywords, so a subschema holding a
+    local reference can be swapped for the resolved subschema without changing
+    validation, sparing the reference lookup for every instance. Recursive
+    references, references that do not resolve and remote references are left in
+    place, as is the whole schema when a subschema changes the base URI with `$id`.
+    Instance data under `const`, `enum`, `default` and `examples` is left untouched.
+    """
+    if not isinstance(schema, dict) or _has_nested_id(schema):
+        return schema
+
+    resolved: dict[str, object] = {}
+    # References being resolved, innermost last, and those found to be recursive.
+    resolving: list[str] = []
+    recursive: set[str] = set()
+
+    def _resolve(ref: str):
+        if ref in resolving:
+            recursive.update(resolving[resolving.index(ref) :])
+            return None
+        if ref not in resolved:
+            targets = list(_resolve_pointer(schema, _split_pointer(ref[1:])))
+            if len(targets) != 1 or "*" in ref:
+                resolved[ref] = None
+            else:
+                resolving.append(ref)
+                target = _walk(targets[0])
+                resolving.pop()
+                resolved[ref] = None if ref in recursive else target
+        return resolved[ref]
+
+    def _walk(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#"):
+                target = _resolve(ref)
+                if target is not None:
+                    return target
+            walked = {}
+            for key, value in node.items():
+                if key in _INSTANCE_KEYWORDS:
+                    walked[key] = value
+                elif key in _SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+                    walked[key] = {name: _walk(subschema) for name, subschema in value.items()}
+                else:
+                    walked[key] = _walk(value)
+            return walked
+        if isinstance(node, list):
+            return [_walk(value) for value in node]
+        return node
+
+    return _walk(schema)
+
+
 class JSONSchemaValidator:
     """A JSON schema validator class that validates JSON data against a given JSON schema."""
 
+    def __init__(
+        self,
+        max_errors: int | None = None,
+        fail_fast: bool = False,
+        keywords: dict[str, Callable] | None = None,
+        profile: bool = False,
+    ) -> None:
+        """
+        Initialize the validator.
+
+        `max_errors` stops validation of a document after that many errors have been
+        found; `fail_fast` is shorthand for `max_errors=1`. `keywords` adds custom
+        keywords to, or replaces keywords in, those provided by net-schema for this
+        validator only.
+
+        With `profile` set, the calls and cumulative time of every keyword are
+        recorded per document in `keyword_times`. Keywords are only wrapped for
+        timing when profiling.
+        """
+        self._max_errors = 1 if fail_fast else max_errors
+        self._keywords = keywords or {}
+        self.profile = profile
+        self.keyword_times: dict[str, list] = {}
+        self.network_claims: list = []
+        self.unique_values: dict = {}
+
     def initialize(self, schema: dict | None) -> None:
         """JSON schema validator with the given JSON schema."""
-        self._validator = Draft7Validator(schema, format_checker=FormatChecker())
-        self._load_custom_validators()
+        keywords = {**VALIDATORS, **self._keywords}
+        if self.profile:
+            keywords = {
+                name: _timed_keyword(self, name, func)
+                for name, func in {**Draft7Validator.VALIDATORS, **keywords}.items()
+            }
+            validator_class = validators.extend(Draft7Validator, keywords)
+        else:
+            validator_class = _validator_class(tuple(keywords.items()))
+        self._validator = validator_class(schema, format_checker=FormatChecker())
         self._errors: list = []
+        pointers = schema.get(UNIQUE_KEYWORD, []) if isinstance(schema, dict) else []
+        self._unique_pointers = {pointer: _split_pointer(pointer) for pointer in pointers}
+
+    def _extract_unique_values(self, data) -> dict[str, list[str]]:
+        """
+        Return the values of the `unique_across_documents` pointers in a document.
+
+        Values are returned as canonical JSON so they can be hashed and compared
+        without keeping the document.
+        """
+        unique_values = {}
+        for pointer, parts in self._unique_pointers.items():
+            values = [
+                json.dumps(value, sort_keys=True, default=str)
+                for value in _resolve_pointer(data, parts)
+            ]
+            if values:
+                unique_values[pointer] = values
+        return unique_values
+
+    def prepare_schema(self, schema: dict | None) -> dict | None:
+        """Return the schema in the form to cache and pass to `initialize`."""
+        return dereference(schema)
 
-    def _load_custom_validators(self) -> None:
-        """Loads custom validators into the JSON schema validator."""
-        self._validator.VALIDATORS.update(VALIDATORS)
+    def fingerprint(self) -> str:
+        """Return a string identifying the options that affect validation results."""
+        keywords = sorted(
+            f"{name}={func.__module__}.{func.__qualname__}"
+            for name, func in self._keywords.items()
+        )
+        return f"{type(self).__name__}:max_errors={self._max_errors}:keywords={keywords}"
 
-    def _validate(self, data: dict | None) -> list:
+    def __getstate__(self) -> dict:
+        """
+        Return the picklable state, leaving out the compiled validator.
+
+        Worker processes receive the validator uninitialized and call `initialize`
+        themselves.
+        """
+        state = self.__dict__.copy()
+        state.pop("_validator", None)
+        return state
+
+    def _validate(self, data: dict | None) -> list[ValidationResult]:
         self._errors = []
+        if self.profile:
+            self.keyword_times = {}
+        # Networks checked by `ip_no_overlap`, for cross-document overlap checks.
+        self.network_claims = []
+        token = network_claims.set(self.network_claims)
 
-        if self._validator.is_valid(data):
-            self._errors.append({"error": False, "msg": None, "key": None})
-        else:
-            try:
-                for error in self._validator.iter_errors(data):
-                    self._errors.append(
-                        {
-                            "error": True,
-                            "msg": error.message,
-                            "key": str(list(error.path) if error.path else None),
-                        }
-                    )
-            except exceptions._WrappedReferencingError as e:
+        try:
+            for error in islice(self._validator.iter_errors(data), self._max_errors):
                 self._errors.append(
-                    {
-                        "error": True,
-                        "msg": f"Unresolved reference error: {str(e)}",
-                        "key": None,
-                    }
-                )
-            except Exception as e:
-                self._errors.append(
-                    {
-                        "error": True,
-                        "msg": f"Unknown error: {str(e)}",
-                        "key": None,
-                    }
+                    ValidationResult(error=True, msg=error.message, path=tuple(error.path))
                 )
+        except exceptions._WrappedReferencingError as e:
+            self._errors.append(
+                ValidationResult(error=True, msg=f"Unresolved reference error: {str(e)}")
+            )
+        except Exception as e:
+            self._errors.append(ValidationResult(error=True, msg=f"Unknown error: {str(e)}"))
+        finally:
+            network_claims.reset(token)
+
+        self.unique_values = self._extract_unique_values(data)
+
+        if not self._errors:
+            self._errors.append(ValidationResult(error=False))
         return self._errors
 
     def results(self, data: dict) -> list:
         """Returns the validation results."""
-        return self._validate(data)
+        return [result.to_dict() for result in self._validate(data)]
+
+    def _document_result(self, name: str, data: Any) -> DocumentResult:
+        """Validate a parsed document, returning its results under the given name."""
+        errors = self._validate(data)
+        for error in errors:
+            error.filename = name
+        return DocumentResult(
+            filename=name,
+            errors=errors,
+            network_claims=self.network_claims,
+            unique_values=self.unique_values,
+        )
+
+    def validate_many(
+        self, documents: Iterable[tuple[str, Any]], jobs: int = 1
+    ) -> Iterator[DocumentResult]:
+        """
+        Validate parsed documents, yielding a `DocumentResult` per document.
+
+        `documents` is an iterable of (name, document) pairs; the name is reported as
+        the filename of the results. Documents are validated with the compiled
+        validator of the last `initialize` call, consumed lazily and yielded in order,
+        so a generator of documents is never held in memory as a whole.
+
+        With `jobs` above 1 (or 0, for one per CPU), documents are validated in
+        chunks by that many worker processes; they must then be picklable. Checks
+        spanning documents (such as `unique_across_documents`) are left to the
+        caller, using the `network_claims` and `unique_values` of the results.
+        """
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1:
+            for name, data in documents:
+                yield self._document_result(name, data)
+            return
+
+        yield from process_map(_init_worker, (self, self._validator.schema), documents, jobs)
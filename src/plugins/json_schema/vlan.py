@@ -1,7 +1,14 @@
 from collections.abc import Generator
 
+from jsonschema import Draft7Validator
 from jsonschema.exceptions import ValidationError
 
+# Keywords that do not affect validation and may sit alongside a VLAN keyword in a
+# batched `items` schema.
+ANNOTATION_KEYWORDS = {"$comment", "default", "description", "examples", "title"}
+
+_draft7_items = Draft7Validator.VALIDATORS["items"]
+
 
 def vlan(validator, value, instance, schema) -> Generator:
     """Check if the value is a valid VLAN ID."""
@@ -38,3 +45,57 @@ def vlan_extended(validator, value, instance, schema) -> Generator:
             )
     except ValueError:
         yield ValidationError(f"'{instance}' is not a valid VLAN ID. It must be an integer.")
+
+
+VLAN_RANGES = {
+    vlan: (1, 4094),
+    vlan_standard: (1, 1001),
+    vlan_extended: (1006, 4094),
+}
+
+
+def _vlan_items_range(validator, items: dict) -> tuple[int, int] | None:
+    """
+    Return the VLAN ID range an `items` schema allows, if it can be batched.
+
+    Only schemas made up of VLAN keywords, an integer or number `type` and
+    annotations can be checked as a range; anything else returns None.
+    """
+    low, high = 1, 4094
+    found = False
+    for keyword, value in items.items():
+        if keyword in ANNOTATION_KEYWORDS or (
+            keyword == "type" and value in ("integer", "number")
+        ):
+            continue
+        # Keywords wrapped for profiling keep the original as `__wrapped__`.
+        keyword_func = validator.VALIDATORS.get(keyword)
+        vlan_range = VLAN_RANGES.get(getattr(keyword_func, "__wrapped__", keyword_func))
+        if vlan_range is None:
+            return None
+        low, high = max(low, vlan_range[0]), min(high, vlan_range[1])
+        found = True
+    return (low, high) if found else None
+
+
+def vlan_items(validator, items, instance, schema) -> Generator:
+    """
+    Validate `items`, checking arrays of VLAN IDs in a single pass.
+
+    When every item is an int and the item schema only holds VLAN keywords, the
+    whole array is range checked with `min`/`max` and only the offending items are
+    validated individually, producing the same errors as the per-item path.
+    Everything else is validated by the standard Draft 7 `items` keyword.
+    """
+    if isinstance(items, dict) and isinstance(instance, list) and instance:
+        vlan_range = _vlan_items_range(validator, items)
+        if vlan_range is not None and set(map(type, instance)) == {int}:
+            low, high = vlan_range
+            if low <= min(instance) and max(instance) <= high:
+                return
+            for index, item in enumerate(instance):
+                if not low <= item <= high:
+                    yield from validator.descend(item, items, path=index)
+            return
+
+    yield from _draft7_items(validator, items, instance, schema)
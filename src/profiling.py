@@ -0,0 +1,122 @@
+"""Aggregate and report the timings and peak memory recorded during validation."""
+
+import heapq
+from typing import TYPE_CHECKING
+
+from .results import DocumentResult
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Default number of documents listed in each report.
+DEFAULT_SLOWEST = 10
+
+
+class Profile:
+    """
+    Aggregate the timings and peak memory of validated documents.
+
+    Documents are added as their results arrive; only the totals and the `slowest`
+    documents, by time and by peak memory, are kept, so memory use does not grow with
+    the number of documents.
+    """
+
+    def __init__(self, slowest: int = DEFAULT_SLOWEST):
+        """Initialize the Profile class."""
+        self._slowest = slowest
+        self.documents = 0
+        self.parse_time = 0.0
+        self.validate_time = 0.0
+        # Calls and cumulative time of each keyword, by keyword.
+        self.keywords: dict[str, list] = {}
+        # (total, filename, parse, validate) of the slowest documents, as a min-heap.
+        self._heap: list[tuple[float, str, float, float]] = []
+        # (peak memory, filename) of the documents with the highest peak, as a min-heap.
+        self._memory_heap: list[tuple[int, str]] = []
+
+    def add(self, result: DocumentResult) -> None:
+        """Add the timings and peak memory of a document, if it has any."""
+        if result.peak_memory is not None:
+            self._push(self._memory_heap, (result.peak_memory, result.filename))
+        if result.profile is None:
+            return
+
+        parse, validate = result.profile["parse"], result.profile["validate"]
+        self.documents += 1
+        self.parse_time += parse
+        self.validate_time += validate
+        for name, (calls, seconds) in result.profile["keywords"].items():
+            counters = self.keywords.setdefault(name, [0, 0.0])
+            counters[0] += calls
+            counters[1] += seconds
+
+        self._push(self._heap, (parse + validate, result.filename, parse, validate))
+
+    def _push(self, heap: list, entry: tuple) -> None:
+        """Add an entry to a heap of the `slowest` largest entries."""
+        if len(heap) < self._slowest:
+            heapq.heappush(heap, entry)
+        elif self._slowest:
+            heapq.heappushpop(heap, entry)
+
+    @property
+    def slowest(self) -> list[tuple[float, str, float, float]]:
+        """Return the slowest documents, slowest first."""
+        return sorted(self._heap, reverse=True)
+
+    @property
+    def largest(self) -> list[tuple[int, str]]:
+        """Return the documents with the highest peak memory, highest first."""
+        return sorted(self._memory_heap, reverse=True)
+
+    def render(self, console: "Console", schema_load_time: float | None = None) -> None:
+        """Print the profile as tables, leaving out what was not recorded."""
+        from rich.table import Table
+
+        if self.documents:
+            self._render_timings(console, schema_load_time)
+
+        if self._memory_heap:
+            memory = Table(title="Peak memory", header_style="bold magenta")
+            memory.add_column("Filename")
+            memory.add_column("Peak (KiB)", justify="right")
+            for peak, filename in self.largest:
+                memory.add_row(filename, f"{peak / 1024:,.1f}")
+            console.print(memory)
+
+    def _render_timings(self, console: "Console", schema_load_time: float | None) -> None:
+        """Print the phase, keyword and slowest document tables."""
+        from rich.table import Table
+
+        phases = Table(title="Profile", header_style="bold magenta")
+        phases.add_column("Phase")
+        phases.add_column("Time (ms)", justify="right")
+        if schema_load_time is not None:
+            phases.add_row("Schema load", f"{schema_load_time * 1000:.2f}")
+        phases.add_row(f"Parse ({self.documents} documents)", f"{self.parse_time * 1000:.2f}")
+        phases.add_row(
+            f"Validate ({self.documents} documents)", f"{self.validate_time * 1000:.2f}"
+        )
+        console.print(phases)
+
+        keywords = Table(
+            title="Keywords",
+            caption="Time includes the keywords nested below each keyword",
+            header_style="bold magenta",
+        )
+        keywords.add_column("Keyword")
+        keywords.add_column("Calls", justify="right")
+        keywords.add_column("Time (ms)", justify="right")
+        for name, (calls, seconds) in sorted(
+            self.keywords.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            keywords.add_row(name, str(calls), f"{seconds * 1000:.2f}")
+        console.print(keywords)
+
+        slowest = Table(title="Slowest documents", header_style="bold magenta")
+        slowest.add_column("Filename")
+        slowest.add_column("Parse (ms)", justify="right")
+        slowest.add_column("Validate (ms)", justify="right")
+        for _, filename, parse, validate in self.slowest:
+            slowest.add_row(filename, f"{parse * 1000:.2f}", f"{validate * 1000:.2f}")
+        console.print(slowest)
@@ -0,0 +1,80 @@
+"""Module contains the result types returned by the validators."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class ValidationResult:
+    """
+    A single validation result for a document.
+
+    The location of a schema error is kept as the raw `path` and only rendered into
+    `key` when it is read. Results without a path (e.g. duplicate keys) carry their
+    location in `location` instead.
+    """
+
+    error: bool
+    msg: str | None = None
+    path: tuple | None = None
+    location: Any = None
+    filename: str | None = None
+
+    @property
+    def key(self) -> Any:
+        """Return the location of the result within the document."""
+        if self.path is None:
+            return self.location
+        return str(list(self.path) if self.path else None)
+
+    def to_dict(self) -> dict:
+        """Return the result as a dict, as returned by earlier versions."""
+        result = {"error": self.error, "msg": self.msg, "key": self.key}
+        if self.filename is not None:
+            result["filename"] = self.filename
+        return result
+
+    @classmethod
+    def from_dict(cls, result: dict) -> "ValidationResult":
+        """Create a result from the output of `to_dict`."""
+        return cls(
+            error=result["error"],
+            msg=result["msg"],
+            location=result["key"],
+            filename=result.get("filename"),
+        )
+
+
+@dataclass
+class DocumentResult:
+    """The validation results of a single document."""
+
+    filename: str
+    errors: list[ValidationResult]
+    # Networks checked by `ip_no_overlap`, resolved across documents.
+    network_claims: list[str] = field(default_factory=list)
+    # Values at the `unique_across_documents` pointers, as canonical JSON, by pointer.
+    unique_values: dict[str, list[str]] = field(default_factory=dict)
+    # Parse and validation times and keyword timings, when profiling.
+    profile: dict | None = None
+    # Peak bytes allocated while loading and validating the document, when traced.
+    peak_memory: int | None = None
+    # Bytes added to the result cache for the document, 0 when replayed from it.
+    cache_written: int = 0
+
+    @property
+    def valid(self) -> bool:
+        """Return True if the document has no errors."""
+        return not any(error.error for error in self.errors)
+
+    def to_dict(self) -> dict:
+        """Return the filename and errors of the document as a dict."""
+        return {"filename": self.filename, "errors": [e.to_dict() for e in self.errors]}
+
+    @classmethod
+    def from_dict(cls, result: dict) -> "DocumentResult":
+        """Create a result from the output of `to_dict`."""
+        return cls(
+            filename=result["filename"],
+            errors=[ValidationResult.from_dict(e) for e in result["errors"]],
+        )
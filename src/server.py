@@ -0,0 +1,170 @@
+"""Validation server and client communicating over a Unix socket."""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import yaml
+
+from .results import DocumentResult
+
+if TYPE_CHECKING:
+    from .main import SchemaValidator
+
+DEFAULT_SOCKET = ".net_schema.sock"
+
+
+class ServerError(Exception):
+    """Raised when the validation server cannot be reached or rejects a request."""
+
+
+def _send(stream, message: dict) -> None:
+    """Write a message to a stream as a line of JSON."""
+    stream.write(json.dumps(message, default=str).encode() + b"\n")
+    stream.flush()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handle the requests of a single client connection.
+
+    Each request is a line of JSON of the form `{"paths": [...]}`. The server replies
+    with a `{"result": ...}` line per document, followed by `{"done": true}`, or with
+    `{"error": ...}` if the request cannot be served.
+    """
+
+    server: "ValidationServer"
+
+    def handle(self) -> None:
+        """Serve the requests sent on the connection until it is closed."""
+        for line in self.rfile:
+            try:
+                paths = json.loads(line)["paths"]
+                if not isinstance(paths, list):
+                    raise TypeError("paths must be a list")
+            except (ValueError, KeyError, TypeError) as e:
+                _send(self.wfile, {"error": f"Invalid request: {e}"})
+                continue
+
+            try:
+                for result in self.server.iter_results(paths):
+                    _send(self.wfile, {"result": result.to_dict()})
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                # Report a missing or unparsable document and keep serving the client.
+                _send(self.wfile, {"error": str(e)})
+                continue
+            _send(self.wfile, {"done": True})
+
+
+class ValidationServer(socketserver.UnixStreamServer):
+    """
+    Serve validation results over a Unix socket.
+
+    The schema validator is created once by `factory` and kept between requests, so
+    clients skip interpreter startup, imports and schema loading. It is created again
+    when one of the `watch` files (typically the schema) changes. Requests are served
+    one at a time.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        factory: "Callable[[], SchemaValidator]",
+        watch: Iterable[str | Path] = (),
+    ):
+        """Initialize the ValidationServer class."""
+        self._socket_path = Path(path)
+        self._factory = factory
+        self._watch = [Path(p) for p in watch]
+        self._stamp = self._watch_stamp()
+        self._validator = factory()
+        _remove_stale_socket(self._socket_path)
+        super().__init__(str(path), _RequestHandler)
+
+    def _watch_stamp(self) -> list[tuple[int, int] | None]:
+        """Return the modification time and size of each watched file."""
+        stamp: list[tuple[int, int] | None] = []
+        for path in self._watch:
+            try:
+                info = path.stat()
+            except OSError:
+                stamp.append(None)
+            else:
+                stamp.append((info.st_mtime_ns, info.st_size))
+        return stamp
+
+    def iter_results(self, paths: list[str]) -> Iterator[DocumentResult]:
+        """Validate the documents under the given paths, yielding the results of each."""
+        stamp = self._watch_stamp()
+        if stamp != self._stamp:
+            self._validator = self._factory()
+            self._stamp = stamp
+        return self._validator.iter_results(paths)
+
+    def server_close(self) -> None:
+        """Close the server and remove its socket."""
+        super().server_close()
+        try:
+            self._socket_path.unlink()
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """Remove a socket left behind by a server that is no longer running."""
+    try:
+        mode = path.stat().st_mode
+    except OSError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ServerError(f"{path} exists and is not a socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            path.unlink()
+        else:
+            raise ServerError(f"A server is already listening on {path}")
+
+
+def _relative(filename: str) -> str:
+    """Return a filename relative to the working directory, if it lies below it."""
+    relative = os.path.relpath(filename)
+    return filename if relative.startswith(os.pardir) else relative
+
+
+def request_results(path: str | Path, paths: Iterable[str | Path]) -> Iterator[DocumentResult]:
+    """
+    Validate documents with the server listening on a Unix socket.
+
+    Paths are sent to the server as absolute paths and the filenames of the results
+    are made relative to the working directory again.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError as e:
+            raise ServerError(f"Cannot connect to the server on {path}: {e}")
+
+        with sock.makefile("rwb") as stream:
+            _send(stream, {"paths": [os.path.abspath(p) for p in paths]})
+            for line in stream:
+                message = json.loads(line)
+                if "error" in message:
+                    raise ServerError(message["error"])
+                if message.get("done"):
+                    return
+
+                result = DocumentResult.from_dict(message["result"])
+                result.filename = _relative(result.filename)
+                for error in result.errors:
+                    error.filename = result.filename
+                yield result
+
+    raise ServerError(f"The server on {path} closed the connection")
@@ -0,0 +1,350 @@
+"""Watch documents and the schema for changes."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from pathlib import Path
+
+from .helpers import DEFAULT_INCLUDE, _matches, is_pruned, iter_documents, resolve_prune
+
+# Seconds between scans of the polling watcher.
+POLL_INTERVAL = 0.5
+
+# Seconds to wait for further events once a change is seen, so that the several
+# events written by a single save are reported together.
+SETTLE_TIME = 0.05
+
+# inotify event flags, from <sys/inotify.h>.
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+
+_IN_MASK = (
+    _IN_MODIFY
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+
+# struct inotify_event, followed by `len` bytes of NUL padded name.
+_IN_EVENT = struct.Struct("iIII")
+
+
+class _Watcher:
+    """
+    Base class of the watchers.
+
+    A watcher reports changes to the documents found under `paths`, selected as by
+    `iter_documents`, and to the extra `files` (such as the schema). The `prune`
+    directories, such as the cache directory, are not watched.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str | Path],
+        files: Iterable[str | Path] = (),
+        recursive: bool = False,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+        prune: Iterable[str | Path] | None = None,
+    ):
+        """Initialize the watcher."""
+        self._paths = [str(path) for path in paths]
+        self._files = {str(Path(file)) for file in files}
+        self._recursive = recursive
+        self._include = list(include) if include else DEFAULT_INCLUDE
+        self._exclude = list(exclude) if exclude else []
+        self._prune = resolve_prune(prune)
+
+    def wait(self, timeout: float | None = None) -> set[str] | None:
+        """
+        Block until files change, returning the paths of the changed files.
+
+        Created and deleted files count as changed. Returns an empty set if nothing
+        changed within `timeout` seconds, or None if the changes could not be
+        tracked (e.g. a directory was moved) and everything should be rescanned.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the resources held by the watcher."""
+
+    def __enter__(self) -> "_Watcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class PollingWatcher(_Watcher):
+    """
+    Detect changes by comparing the modification times of the watched files.
+
+    Works on every platform, at the cost of scanning the watched paths every
+    `interval` seconds.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str | Path],
+        files: Iterable[str | Path] = (),
+        recursive: bool = False,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+        prune: Iterable[str | Path] | None = None,
+        interval: float = POLL_INTERVAL,
+    ):
+        """Initialize the PollingWatcher class."""
+        super().__init__(paths, files, recursive, include, exclude, prune)
+        self._interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        """Return the modification time and size of each watched file."""
+        documents = iter_documents(
+            self._paths,
+            self._recursive,
+            self._include,
+            self._exclude,
+            missing_ok=True,
+            prune=self._prune,
+        )
+        snapshot = {}
+        for path in chain((str(document) for document in documents), self._files):
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (info.st_mtime_ns, info.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None = None) -> set[str] | None:
+        """See `_Watcher.wait`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+
+            if deadline is None:
+                time.sleep(self._interval)
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self._interval, remaining))
+
+
+class InotifyWatcher(_Watcher):
+    """
+    Detect changes with Linux inotify, without scanning the watched paths.
+
+    Every watched directory gets an inotify watch. Changes to directories
+    themselves, and queue overflows, are reported as a rescan.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str | Path],
+        files: Iterable[str | Path] = (),
+        recursive: bool = False,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+        prune: Iterable[str | Path] | None = None,
+    ):
+        """Initialize the InotifyWatcher class."""
+        super().__init__(paths, files, recursive, include, exclude, prune)
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._inotify_add_watch = libc.inotify_add_watch
+        self._inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        # Directory of each watch descriptor.
+        self._directories: dict[int, str] = {}
+        # Paths of the watched directories below their search roots.
+        self._trees: dict[str, set[str]] = {}
+        # Files watched by name, i.e. the schema and documents passed as files.
+        self._watched_files: set[str] = set()
+        try:
+            self._add_all()
+        except OSError:
+            self.close()
+            raise
+
+    def _add_directory(self, directory: str) -> None:
+        """Start watching a directory."""
+        wd = self._inotify_add_watch(self._fd, os.fsencode(directory), _IN_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        self._directories[wd] = str(Path(directory))
+
+    def _add_tree(self, root: str, relative: str) -> None:
+        """Start watching a search root, or a directory below it when recursive."""
+        directory = os.path.join(root, relative) if relative else root
+        self._add_directory(directory)
+        self._trees.setdefault(str(Path(directory)), set()).add(relative)
+        if not self._recursive:
+            return
+
+        with os.scandir(directory) as it:
+            for entry in it:
+                entry_relative = f"{relative}/{entry.name}" if relative else entry.name
+                if (
+                    entry.is_dir(follow_symlinks=False)
+                    and not _matches(entry_relative, self._exclude)
+                    and not is_pruned(entry.path, self._prune)
+                ):
+                    self._add_tree(root, entry_relative)
+
+    def _add_all(self) -> None:
+        """Start watching every path, skipping those that do not exist."""
+        self._trees.clear()
+        self._watched_files = set(self._files)
+        for path in self._paths:
+            if os.path.isdir(path):
+                try:
+                    self._add_tree(path, "")
+                except FileNotFoundError:
+                    pass
+                continue
+
+            name = os.path.basename(path)
+            if _matches(name, self._include) and not _matches(name, self._exclude):
+                self._watched_files.add(str(Path(path)))
+
+        for file in self._watched_files:
+            try:
+                self._add_directory(os.path.dirname(file) or os.curdir)
+            except FileNotFoundError:
+                pass
+
+    def _read_events(self) -> Iterator[tuple[int, int, str]]:
+        """Yield the pending events as (watch descriptor, mask, name) tuples."""
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _IN_EVENT.unpack_from(data, offset)
+                offset += _IN_EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                yield wd, mask, os.fsdecode(name)
+
+    def _changed_path(self, directory: str, name: str) -> str | None:
+        """Return the path an event reports a change to, if it is watched."""
+        path = str(Path(directory, name))
+        if path in self._watched_files:
+            return path
+
+        for relative in self._trees.get(directory, ()):
+            entry_relative = f"{relative}/{name}" if relative else name
+            if not _matches(entry_relative, self._exclude) and _matches(
+                entry_relative, self._include
+            ):
+                return path
+        return None
+
+    def wait(self, timeout: float | None = None) -> set[str] | None:
+        """See `_Watcher.wait`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: set[str] = set()
+        while True:
+            # Once a change is seen, keep collecting until the events of a save settle.
+            if changed:
+                wait_time: float | None = SETTLE_TIME
+            elif deadline is None:
+                wait_time = None
+            else:
+                wait_time = max(0.0, deadline - time.monotonic())
+
+            if not select.select([self._fd], [], [], wait_time)[0]:
+                if changed or deadline is not None:
+                    return changed
+                continue
+
+            rescan = False
+            for wd, mask, name in self._read_events():
+                if mask & _IN_IGNORED:
+                    self._directories.pop(wd, None)
+                    continue
+                directory = self._directories.get(wd)
+                if mask & _IN_Q_OVERFLOW:
+                    rescan = True
+                elif directory is None:
+                    continue
+                elif mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                    rescan = rescan or directory in self._trees
+                elif mask & _IN_ISDIR:
+                    rescan = rescan or (
+                        self._recursive
+                        and directory in self._trees
+                        and not is_pruned(os.path.join(directory, name), self._prune)
+                    )
+                else:
+                    path = self._changed_path(directory, name)
+                    if path is not None:
+                        changed.add(path)
+
+            if rescan:
+                try:
+                    self._add_all()
+                except OSError:
+                    pass
+                return None
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_watcher(
+    paths: Iterable[str | Path],
+    files: Iterable[str | Path] = (),
+    recursive: bool = False,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    prune: Iterable[str | Path] | None = None,
+) -> _Watcher:
+    """Return an inotify watcher on Linux, falling back to polling elsewhere."""
+    paths = list(paths)
+    prune = list(prune or ())
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths, files, recursive, include, exclude, prune)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths, files, recursive, include, exclude, prune)
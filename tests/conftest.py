@@ -4,7 +4,7 @@ import sys
 from pathlib import Path
 
 import pytest
-from jsonschema import Draft7Validator, FormatChecker
+from jsonschema import Draft7Validator, FormatChecker, validators
 
 sys.path.append(f"{Path(__file__).parent.parent}/src")
 
@@ -25,8 +25,10 @@ from plugins.json_schema.ip import (
     ip_ipv6,
     ip_linklocal,
     ip_multicast,
+    ip_network,
     ip_private,
     ip_reserved,
+    ip_within,
 )
 from plugins.json_schema.vlan import vlan, vlan_extended, vlan_standard
 
@@ -50,6 +52,8 @@ IP_VALIDATORS = {
     "ip_private": ip_private,
     "ip_reserved": ip_reserved,
     "ip_linklocal": ip_linklocal,
+    "ip_network": ip_network,
+    "ip_within": ip_within,
 }
 
 VLAN_VALIDATORS = {
@@ -64,10 +68,9 @@ VALIDATORS = {**ASN_VALIDATORS, **IP_VALIDATORS, **VLAN_VALIDATORS}
 @pytest.fixture(scope="session")
 def basic_validator():
     """Returns a basic JSON schema validator."""
+    validator_class = validators.extend(Draft7Validator, VALIDATORS)
 
     def _basic_validator(schema):
-        v = Draft7Validator(schema=schema, format_checker=FormatChecker())
-        Draft7Validator.VALIDATORS.update(VALIDATORS)
-        return v
+        return validator_class(schema=schema, format_checker=FormatChecker())
 
     return _basic_validator
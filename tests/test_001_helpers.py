@@ -1,14 +1,24 @@
 import json
+import operator
+from functools import partial
 
 import pytest
 import yaml
 
+import helpers
 from helpers import (
+    YAML_BACKEND,
     DuplicateKeyError,
     SafeCustomYamlLoader,
     check_for_duplicate_keys,
+    iter_documents,
     json_object_pairs_hook,
+    load_document,
     load_yaml_or_json,
+    match_document,
+    parse_size,
+    process_map,
+    read_document,
 )
 
 
@@ -109,3 +119,213 @@ def test_yaml_no_duplicate_keys():
     """
     status, error, key = check_for_duplicate_keys(yaml_data, "yaml")
     assert status
+
+
+def test_load_document_yaml_duplicate_keys(tmp_path):
+    """Test that duplicate keys are reported alongside the loaded YAML document."""
+    filename = tmp_path / "test.yaml"
+    filename.write_text("key: value1\nkey: value2\nnested:\n  a: 1\n  a: 2\n")
+
+    data, duplicate_keys = load_document(filename, check_dup_keys=True)
+
+    assert data == {"key": "value2", "nested": {"a": 2}}
+    assert duplicate_keys == ["key", "a"]
+
+
+def test_load_document_json_duplicate_keys(tmp_path):
+    """Test that duplicate keys are reported alongside the loaded JSON document."""
+    filename = tmp_path / "test.json"
+    filename.write_text('{"key": "value1", "key": "value2"}')
+
+    data, duplicate_keys = load_document(filename, check_dup_keys=True)
+
+    assert data == {"key": "value2"}
+    assert duplicate_keys == ["key"]
+
+
+def test_load_document_yaml_merge_keys(tmp_path):
+    """Test that YAML merge keys are not reported as duplicates."""
+    filename = tmp_path / "test.yaml"
+    filename.write_text("base: &base\n  a: 1\nchild:\n  <<: *base\n  a: 2\n")
+
+    data, duplicate_keys = load_document(filename, check_dup_keys=True)
+
+    assert data["child"] == {"a": 2}
+    assert duplicate_keys == []
+
+
+def test_load_document_without_duplicate_check(tmp_path):
+    """Test that duplicate keys are not tracked unless requested."""
+    filename = tmp_path / "test.yaml"
+    filename.write_text("key: value1\nkey: value2\n")
+
+    data, duplicate_keys = load_document(filename)
+
+    assert data == {"key": "value2"}
+    assert duplicate_keys == []
+
+
+def test_yaml_loaders_use_libyaml_when_available():
+    """Test that the YAML loaders are built on libyaml when PyYAML was built with it."""
+    expected = "libyaml" if yaml.__with_libyaml__ else "pyyaml"
+    assert YAML_BACKEND == expected
+    if yaml.__with_libyaml__:
+        assert issubclass(SafeCustomYamlLoader, yaml.CSafeLoader)
+
+
+def test_load_document_json_non_standard_values(tmp_path):
+    """Test that JSON accepted by the standard library loads with any backend."""
+    filename = tmp_path / "test.json"
+    filename.write_text('{"big": 18446744073709551616, "nan": NaN}')
+
+    data, _ = load_document(filename)
+
+    assert data["big"] == 18446744073709551616
+    assert data["nan"] != data["nan"]
+
+
+@pytest.mark.parametrize(
+    "name, content",
+    [
+        ("test.json", '{"key": 1, "key": 2, "nan": NaN}'),
+        ("test.yaml", "key: 1\nkey: 2\nnan: .nan\n"),
+    ],
+)
+def test_load_document_memory_mapped(tmp_path, monkeypatch, name, content):
+    """Test that large documents are memory-mapped and load as when read."""
+    filename = tmp_path / name
+    filename.write_text(content)
+    read = load_document(filename, check_dup_keys=True), load_document(filename)
+
+    monkeypatch.setattr(helpers, "MMAP_THRESHOLD", 1)
+    with read_document(filename) as data:
+        assert not isinstance(data, bytes)
+    mapped = load_document(filename, check_dup_keys=True), load_document(filename)
+
+    for (data, duplicate_keys), (expected, expected_keys) in zip(mapped, read, strict=True):
+        assert data["key"] == expected["key"] == 2
+        assert data["nan"] != data["nan"]
+        assert duplicate_keys == expected_keys
+    assert mapped[0][1] == ["key"]
+
+
+def test_process_map_keeps_input_order():
+    """Test that items mapped on worker processes are yielded in input order."""
+    items = range(2 * helpers.CHUNK_SIZE + 5)
+    # Each worker builds its function once, here partial(operator.mul, 3).
+    results = process_map(partial, (operator.mul, 3), iter(items), jobs=2)
+    assert list(results) == [3 * item for item in items]
+
+
+def test_parse_size():
+    """Test parsing sizes with and without binary suffixes."""
+    assert parse_size("4096") == 4096
+    assert parse_size("512K") == 512 * 1024
+    assert parse_size("100MB") == 100 * 1024**2
+    assert parse_size("2 GiB") == 2 * 1024**3
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size("10T")
+
+
+@pytest.fixture
+def document_tree(tmp_path):
+    """Return a directory tree of documents."""
+    for name in [
+        "rtr001.yml",
+        "notes.txt",
+        "group_vars/all.yaml",
+        "group_vars/site1/core.json",
+        "archive/rtr000.yml",
+    ]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}")
+    return tmp_path
+
+
+def test_iter_documents_top_level_only(document_tree):
+    """Test that only the top level is searched unless recursive is set."""
+    documents = list(iter_documents(str(document_tree)))
+    assert documents == [document_tree / "rtr001.yml"]
+
+
+def test_iter_documents_recursive(document_tree):
+    """Test that subdirectories are searched in path order when recursive is set."""
+    documents = list(iter_documents(str(document_tree), recursive=True))
+    assert documents == sorted(documents)
+    assert [d.relative_to(document_tree).as_posix() for d in documents] == [
+        "archive/rtr000.yml",
+        "group_vars/all.yaml",
+        "group_vars/site1/core.json",
+        "rtr001.yml",
+    ]
+
+
+def test_iter_documents_include_and_exclude(document_tree):
+    """Test that include and exclude globs filter files and prune directories."""
+    documents = iter_documents(
+        [str(document_tree)],
+        recursive=True,
+        include=["*.yml", "*.yaml"],
+        exclude=["archive", "group_vars/site1/*"],
+    )
+    assert [d.relative_to(document_tree).as_posix() for d in documents] == [
+        "group_vars/all.yaml",
+        "rtr001.yml",
+    ]
+
+
+def test_iter_documents_prune(document_tree, monkeypatch):
+    """Test that pruned directories are skipped however they are spelled."""
+    monkeypatch.chdir(document_tree)
+    documents = iter_documents(".", recursive=True, prune=["./group_vars/../archive"])
+    assert [d.as_posix() for d in documents] == [
+        "group_vars/all.yaml",
+        "group_vars/site1/core.json",
+        "rtr001.yml",
+    ]
+
+
+@pytest.mark.parametrize("recursive", [False, True])
+def test_match_document_agrees_with_iter_documents(document_tree, recursive):
+    """Test that match_document accepts exactly the paths iter_documents yields."""
+    kwargs = {
+        "recursive": recursive,
+        "exclude": ["site1"],
+        "prune": [document_tree / "archive"],
+    }
+    roots = [document_tree, document_tree / "group_vars/site1/core.json"]
+    documents = list(iter_documents(roots, **kwargs))
+
+    matched = [
+        match_document(path, roots, **kwargs)
+        for path in sorted(document_tree.rglob("*"))
+        if path.is_file()
+    ]
+
+    assert sorted(m for m in matched if m is not None) == sorted(documents)
+    assert match_document(document_tree / "deleted.yml", roots, **kwargs) == (
+        document_tree / "deleted.yml"
+    )
+
+
+def test_iter_documents_files_and_directories(document_tree):
+    """Test that files and directories can be mixed."""
+    documents = list(
+        iter_documents([document_tree / "archive/rtr000.yml", document_tree / "group_vars"])
+    )
+    assert documents == [
+        document_tree / "archive/rtr000.yml",
+        document_tree / "group_vars/all.yaml",
+    ]
+
+
+def test_iter_documents_missing_path(document_tree):
+    """Test that a missing path raises unless missing paths are allowed."""
+    missing = document_tree / "host_varz"
+    with pytest.raises(FileNotFoundError, match="host_varz"):
+        list(iter_documents([document_tree / "rtr001.yml", missing]))
+
+    assert list(iter_documents([document_tree / "rtr001.yml", missing], missing_ok=True)) == [
+        document_tree / "rtr001.yml"
+    ]
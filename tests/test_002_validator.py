@@ -1,8 +1,11 @@
 """Module contains tests for the JSONSchemaValidator class."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from jsonschema import Draft7Validator, ValidationError
 
-from plugins.json_schema.validator import JSONSchemaValidator
+from plugins.json_schema.validator import JSONSchemaValidator, dereference
 
 
 @pytest.fixture
@@ -45,3 +48,164 @@ def test_invalid_data_validation(validator, bad_data):
     """Test invalid data."""
     result = validator.results(bad_data)
     assert any(error["error"] for error in result)
+
+
+def test_max_errors_limits_reported_errors(schema):
+    """Test that validation of a document stops after max_errors errors."""
+    schema = {**schema, "properties": {**schema["properties"], "hostname": {"type": "string"}}}
+    data = {"asn": 65000, "hostname": 1}
+
+    validator = JSONSchemaValidator()
+    validator.initialize(schema)
+    assert len(validator.results(data)) == 2
+
+    validator = JSONSchemaValidator(max_errors=1)
+    validator.initialize(schema)
+    assert len(validator.results(data)) == 1
+
+
+def test_fail_fast_reports_first_error(schema):
+    """Test that fail_fast stops validation at the first error."""
+    validator = JSONSchemaValidator(fail_fast=True)
+    validator.initialize(schema)
+    result = validator.results({})
+    assert len(result) == 1
+    assert result[0]["error"]
+
+
+def test_unique_values_are_extracted_by_pointer():
+    """Test that values at unique_across_documents pointers are extracted as JSON."""
+    validator = JSONSchemaValidator()
+    validator.initialize(
+        {"unique_across_documents": ["/loopback", "/vlans/*/name", "/a~1b", "/missing"]}
+    )
+    validator.results(
+        {"loopback": "10.0.0.1", "vlans": [{"name": "mgmt"}, {"name": "data"}], "a/b": [1]}
+    )
+
+    assert validator.unique_values == {
+        "/loopback": ['"10.0.0.1"'],
+        "/vlans/*/name": ['"mgmt"', '"data"'],
+        "/a~1b": ["[1]"],
+    }
+
+
+def test_dereference_inlines_local_refs():
+    """Test that local refs are inlined while recursive and unresolvable refs are kept."""
+    schema = {
+        "definitions": {
+            "name": {"type": "string"},
+            "node": {"properties": {"child": {"$ref": "#/definitions/node"}}},
+        },
+        "properties": {
+            "hostname": {"$ref": "#/definitions/name"},
+            "tree": {"$ref": "#/definitions/node"},
+            "missing": {"$ref": "#/definitions/missing"},
+        },
+    }
+
+    properties = dereference(schema)["properties"]
+
+    assert properties["hostname"] == {"type": "string"}
+    assert properties["tree"] == {"$ref": "#/definitions/node"}
+    assert properties["missing"] == {"$ref": "#/definitions/missing"}
+    assert schema["properties"]["hostname"] == {"$ref": "#/definitions/name"}
+
+
+def test_dereference_leaves_instance_data_alone():
+    """Test that refs inside const, enum, default and examples are kept as values."""
+    ref = {"$ref": "#/definitions/x"}
+    schema = {
+        "definitions": {"x": {"type": "integer"}},
+        "properties": {
+            "const": {"$ref": "#/definitions/x"},
+            "literal": {"const": ref, "enum": [ref], "default": ref, "examples": [ref]},
+        },
+    }
+
+    properties = dereference(schema)["properties"]
+
+    assert properties["const"] == {"type": "integer"}
+    assert properties["literal"] == schema["properties"]["literal"]
+
+    validator = JSONSchemaValidator()
+    validator.initialize(validator.prepare_schema(schema))
+    assert not any(result["error"] for result in validator.results({"literal": ref}))
+
+
+def test_prepared_schema_validates_like_the_original(schema, good_data, bad_data):
+    """Test that the prepared schema reports the same results as the original."""
+    original, prepared = JSONSchemaValidator(), JSONSchemaValidator()
+    original.initialize(schema)
+    prepared.initialize(prepared.prepare_schema(schema))
+
+    assert prepared.results(good_data) == original.results(good_data)
+    assert prepared.results(bad_data) == original.results(bad_data)
+
+
+def test_keywords_do_not_leak_into_draft7():
+    """Test that initializing a validator leaves Draft7Validator's keywords unchanged."""
+    keywords = dict(Draft7Validator.VALIDATORS)
+    JSONSchemaValidator().initialize({"asn_public": True})
+
+    assert Draft7Validator.VALIDATORS == keywords
+    assert "asn_public" not in Draft7Validator.VALIDATORS
+
+
+def test_keywords_are_per_instance():
+    """Test that validators with different keywords run side by side in threads."""
+
+    def hostname(validator, value, instance, schema):
+        if value and not str(instance).startswith("rtr"):
+            yield ValidationError(f"{instance} is not a router hostname")
+
+    schema = {"properties": {"hostname": {"hostname": True}}}
+    custom, default = (
+        JSONSchemaValidator(keywords={"hostname": hostname}),
+        JSONSchemaValidator(),
+    )
+    custom.initialize(schema)
+    default.initialize(schema)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(
+                lambda validator: validator.results({"hostname": "sw001"}),
+                [custom, default] * 50,
+            )
+        )
+
+    assert all(result[0]["msg"] == "sw001 is not a router hostname" for result in results[::2])
+    assert all(result[0]["error"] is False for result in results[1::2])
+    assert custom.fingerprint() != default.fingerprint()
+
+
+def test_validate_many_yields_results_in_order(validator, good_data, bad_data):
+    """Test that validate_many yields a named result per document, consuming them lazily."""
+    consumed = []
+
+    def documents():
+        for index in range(5):
+            consumed.append(index)
+            yield f"device{index}", bad_data if index % 2 else good_data
+
+    results = validator.validate_many(documents())
+    first = next(results)
+
+    assert consumed == [0]
+    assert (first.filename, first.valid) == ("device0", True)
+    rest = list(results)
+    assert [result.filename for result in rest] == ["device1", "device2", "device3", "device4"]
+    assert [result.valid for result in rest] == [False, True, False, True]
+    assert all(error.filename == "device1" for error in rest[0].errors)
+
+
+def test_validate_many_in_parallel_matches_serial(validator, good_data, bad_data):
+    """Test that validating documents in worker processes gives the serial results."""
+    documents = [(f"device{index}", [good_data, bad_data][index % 2]) for index in range(150)]
+
+    serial = list(validator.validate_many(documents))
+    parallel = list(validator.validate_many(iter(documents), jobs=2))
+
+    assert [r.filename for r in parallel] == [r.filename for r in serial]
+    assert [r.errors for r in parallel] == [r.errors for r in serial]
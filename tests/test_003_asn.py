@@ -8,6 +8,7 @@ import pytest
 
 sys.path.append(f"{Path(__file__).parent.parent}/src")
 
+from plugins.json_schema.asn import ASN_CLASS_RANGES, _parse_asn, asn_class, asn_classes
 
 ASN_FIXTURE = f"{Path(__file__).parent}/fixtures/asn.json"
 ASN_FIXTURE_CHECKS = [
@@ -82,3 +83,58 @@ def test_asn_validators_invalid(basic_validator, check, asn_fixture):
 
     v = basic_validator(schema)
     assert v.is_valid(data) == False
+
+
+def test_asn_classes_match_class_ranges():
+    """Test that the bisect table agrees with the class ranges at every boundary."""
+    values = {-1, 2**32}
+    for ranges in ASN_CLASS_RANGES.values():
+        for low, high in ranges:
+            values.update((low - 1, low, high, high + 1))
+
+    for value in values:
+        expected = {
+            name
+            for name, ranges in ASN_CLASS_RANGES.items()
+            if any(low <= value <= high for low, high in ranges)
+        }
+        assert asn_classes(value) == expected, value
+
+
+@pytest.mark.parametrize(
+    "value, instance, valid",
+    [
+        ("private", "65000", True),
+        ("private", 8000, False),
+        (["public", "documentation"], 64500, True),
+        (["public", "documentation"], "65000", False),
+        ("reserved", 0, True),
+        ("public", "not-an-asn", False),
+    ],
+)
+def test_asn_class(value, instance, valid):
+    """
+    Test the asn_class validator.
+
+    Args:
+    ----
+        value: The allowed ASN classes.
+        instance: The ASN to validate.
+        valid: Whether the ASN should be valid.
+
+    Returns:
+    -------
+        None
+
+    """
+    assert (not list(asn_class(None, value, instance, {}))) == valid
+
+
+def test_asn_is_parsed_once_per_value(basic_validator):
+    """Test that stacked ASN keywords share a single parse of each value."""
+    schema = {"asn_public": True, "asn_4byte": True, "asn": True}
+    _parse_asn.cache_clear()
+
+    basic_validator(schema).is_valid("8000")
+
+    assert _parse_asn.cache_info().misses == 1
@@ -1,5 +1,6 @@
 """Test cases for IP address validators."""
 
+import ipaddress
 import json
 import sys
 from pathlib import Path
@@ -8,6 +9,7 @@ import pytest
 
 sys.path.append(f"{Path(__file__).parent.parent}/src")
 
+from plugins.json_schema.ip import NetworkIndex, _parse_ip, ip_is, ip_within, parse_ip
 
 IP_FIXTURE = f"{Path(__file__).parent}/fixtures/ip.json"
 
@@ -20,6 +22,7 @@ IP_FIXTURE_CHECKS = [
     "ip_reserved_valid",
     "ip_linklocal_valid",
     "ip_network_valid",
+    "ip_within_valid",
 ]
 
 
@@ -75,3 +78,105 @@ def test_ip_validators_invalid(basic_validator, check, ip_fixture):
 
     v = basic_validator(schema)
     assert v.is_valid(data) == False
+
+
+def _boundary_addresses():
+    """Return the addresses either side of every network the stdlib classifies."""
+    addresses = ["::ffff:10.0.0.1", "::ffff:8.8.8.8", "::ffff:224.0.0.1", "fe80::1%eth0"]
+    for constants in (ipaddress._IPv4Constants, ipaddress._IPv6Constants):
+        for value in vars(constants).values():
+            for network in value if isinstance(value, list) else [value]:
+                if not isinstance(network, ipaddress.IPv4Network | ipaddress.IPv6Network):
+                    continue
+                cls = ipaddress.IPv4Address if network.version == 4 else ipaddress.IPv6Address
+                first, last = int(network.network_address), int(network.broadcast_address)
+                for candidate in (first - 1, first, last, last + 1):
+                    if 0 <= candidate < 2**network.max_prefixlen:
+                        addresses.append(str(cls(candidate)))
+    return addresses
+
+
+@pytest.mark.parametrize("category", ["private", "reserved", "multicast", "link_local"])
+def test_ip_is_matches_stdlib(category):
+    """
+    Test that the range tables classify addresses as the ipaddress properties do.
+
+    Args:
+    ----
+        category: The address category to compare.
+
+    Returns:
+    -------
+        None
+
+    """
+    for address in map(ipaddress.ip_address, _boundary_addresses()):
+        assert ip_is(address, category) == getattr(address, f"is_{category}"), address
+
+
+def test_parse_ip_is_memoized():
+    """Test that repeated values are parsed once and invalid values return None."""
+    _parse_ip.cache_clear()
+
+    assert parse_ip("10.0.0.1") == parse_ip("10.0.0.1") == ipaddress.ip_address("10.0.0.1")
+    assert parse_ip("not.an.ip") is None
+    assert parse_ip(["10.0.0.1"]) is None
+    assert _parse_ip.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    "instance, valid",
+    [
+        ("10.0.255.255", True),
+        ("10.0.0.0/15", True),
+        ("10.0.0.0/14", False),
+        ("2001:db8::1", True),
+        ("2001:db9::1", False),
+        ("not.an.ip", False),
+    ],
+)
+def test_ip_within_merges_adjacent_supernets(instance, valid):
+    """
+    Test that networks spanning adjacent supernets are within them.
+
+    Args:
+    ----
+        instance: The address or network to validate.
+        valid: Whether the instance should be valid.
+
+    Returns:
+    -------
+        None
+
+    """
+    supernets = ["10.0.0.0/16", "10.1.0.0/16", "2001:db8::/32"]
+    assert (not list(ip_within(None, supernets, instance, {}))) == valid
+
+
+def test_network_index_reports_overlapping_claims():
+    """Test that overlapping networks are reported with the claims they overlap."""
+    index = NetworkIndex()
+    supernet = ipaddress.ip_network("10.1.0.0/16")
+
+    assert index.claim(supernet, "rtr001.yml") == []
+    assert index.claim(ipaddress.ip_network("10.2.0.0/24"), "rtr002.yml") == []
+    assert index.claim(ipaddress.ip_network("10.0.255.0/24"), "rtr002.yml") == []
+    assert index.claim(ipaddress.ip_network("2001:db8::/64"), "rtr002.yml") == []
+    assert index.claim(ipaddress.ip_network("10.1.7.0/24"), "rtr003.yml") == [
+        (supernet, "rtr001.yml")
+    ]
+    assert len(index.claim(ipaddress.ip_network("10.0.0.0/8"), "rtr003.yml")) == 4
+
+
+def test_network_index_indexes_overlapping_claims():
+    """Test that a network overlapping only a rejected claim is still reported."""
+    index = NetworkIndex()
+    a, b, c = (
+        ipaddress.ip_network(network)
+        for network in ("10.0.0.0/24", "10.0.0.0/16", "10.0.5.0/24")
+    )
+
+    assert index.claim(a, "a.yml") == []
+    assert index.claim(b, "b.yml") == [(a, "a.yml")]
+    assert index.claim(c, "c.yml") == [(b, "b.yml")]
+    assert index.claim(a, "d.yml") == [(b, "b.yml"), (a, "a.yml")]
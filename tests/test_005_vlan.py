@@ -5,9 +5,11 @@ import sys
 from pathlib import Path
 
 import pytest
+from jsonschema import Draft7Validator, validators
 
 sys.path.append(f"{Path(__file__).parent.parent}/src")
 
+from plugins.json_schema.vlan import vlan, vlan_extended, vlan_items, vlan_standard
 
 VLAN_FIXTURE = f"{Path(__file__).parent}/fixtures/vlan.json"
 
@@ -70,3 +72,55 @@ def test_vlan_validators_invalid(basic_validator, check, vlan_fixture):
     data = vlan_fixture[check]["data"]["invalid"]
     v = basic_validator(schema)
     assert v.is_valid(data) == False
+
+
+@pytest.fixture(scope="session")
+def vlan_items_validator():
+    """Return a validator class with the batched VLAN items keyword."""
+    return validators.extend(
+        Draft7Validator,
+        {
+            "items": vlan_items,
+            "vlan": vlan,
+            "vlan_standard": vlan_standard,
+            "vlan_extended": vlan_extended,
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "items, instance",
+    [
+        ({"type": "integer", "vlan": True}, [1, 100, 4094]),
+        ({"type": "integer", "vlan": True}, [0, 100, 4095, 200]),
+        ({"vlan_standard": True, "vlan": True}, [1, 1001, 1002]),
+        ({"vlan_extended": True}, [1005, 1006, "2000", True]),
+        ({"vlan": True, "minimum": 10}, [5, 100]),
+        ({"vlan": True}, []),
+    ],
+)
+def test_vlan_items_matches_per_item_validation(vlan_items_validator, items, instance):
+    """
+    Test that batched VLAN arrays report the same errors as per-item validation.
+
+    Args:
+    ----
+        vlan_items_validator: The validator class with the batched items keyword.
+        items: The items schema.
+        instance: The array to validate.
+
+    Returns:
+    -------
+        None
+
+    """
+    schema = {"type": "array", "items": items}
+    per_item = validators.extend(
+        Draft7Validator,
+        {"vlan": vlan, "vlan_standard": vlan_standard, "vlan_extended": vlan_extended},
+    )
+
+    def _errors(cls):
+        return [(e.message, list(e.path)) for e in cls(schema).iter_errors(instance)]
+
+    assert _errors(vlan_items_validator) == _errors(per_item)
@@ -0,0 +1,393 @@
+"""Module contains tests for the SchemaValidator class."""
+
+import io
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from click.testing import CliRunner
+from rich.console import Console
+
+from src.main import SchemaValidator, _watch, main
+from src.plugins.json_schema.validator import JSONSchemaValidator
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+@pytest.fixture
+def schema_validator():
+    """Return a factory for initialized SchemaValidator instances."""
+
+    def _schema_validator(**kwargs):
+        kwargs.setdefault("document_path", str(EXAMPLES / "host_vars"))
+        schema_validator = SchemaValidator(
+            schema=str(EXAMPLES / "schema.yaml"), validator=JSONSchemaValidator(), **kwargs
+        )
+        schema_validator.initialize()
+        return schema_validator
+
+    return _schema_validator
+
+
+def test_results_are_sorted_by_filename(schema_validator):
+    """Test that results are reported in filename order."""
+    errors = schema_validator().results["errors"]
+    filenames = [error["filename"] for error in errors]
+    assert filenames == sorted(filenames)
+
+
+def test_parallel_results_match_serial(schema_validator):
+    """Test that a process pool produces the same results as a serial run."""
+    serial = schema_validator(check_dup_keys=True).results
+    parallel = schema_validator(check_dup_keys=True, jobs=2).results
+    assert parallel == serial
+
+
+def test_iter_results_yields_one_result_per_document(schema_validator):
+    """Test that iter_results yields a result for each document, in order."""
+    results = list(schema_validator().iter_results())
+    filenames = [result.filename for result in results]
+
+    assert filenames == sorted(str(f) for f in (EXAMPLES / "host_vars").iterdir())
+    assert [result.valid for result in results] == [True, False, True]
+
+
+def test_documents_over_max_file_size_are_errors(schema_validator):
+    """Test that documents larger than max_file_size are reported without validation."""
+    sizes = {str(f): f.stat().st_size for f in (EXAMPLES / "host_vars").iterdir()}
+    limit = sorted(sizes.values())[1]
+    results = list(schema_validator(max_file_size=limit).iter_results())
+
+    for result in results:
+        if sizes[result.filename] > limit:
+            assert [error.msg for error in result.errors] == [
+                f"File size of {sizes[result.filename]} bytes exceeds the maximum of "
+                f"{limit} bytes"
+            ]
+        else:
+            assert "exceeds the maximum" not in str(result.errors)
+    assert any(sizes[result.filename] > limit for result in results)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_trace_memory_records_peak_memory(schema_validator, jobs):
+    """Test that trace_memory records the peak memory of every document."""
+    import tracemalloc
+
+    results = list(schema_validator(trace_memory=True, jobs=jobs).iter_results())
+
+    assert all(result.peak_memory > 0 for result in results)
+    assert not tracemalloc.is_tracing()
+    assert all(r.peak_memory is None for r in schema_validator().iter_results())
+
+
+@pytest.mark.parametrize(
+    "args, message",
+    [
+        (["-p", str(EXAMPLES), "--connect", "net_schema.sock", "-k"], "--check-dup-keys"),
+        (
+            ["-p", str(EXAMPLES), "--connect", "net_schema.sock", "--exclude", "*.json"],
+            "--exclude",
+        ),
+        (["--serve", "net_schema.sock", "-j", "2"], "--jobs"),
+    ],
+)
+def test_cli_rejects_options_the_server_would_ignore(args, message):
+    """Test that options the client cannot apply are rejected rather than ignored."""
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 2
+    assert message in result.output
+
+
+def test_cli_rejects_missing_document_path(tmp_path):
+    """Test that a mistyped document path is a usage error rather than an empty run."""
+    result = CliRunner().invoke(
+        main, ["-p", str(tmp_path / "host_varz"), "-s", str(EXAMPLES / "schema.yaml")]
+    )
+    assert result.exit_code == 2
+    assert "does not exist" in result.output
+
+
+@pytest.fixture
+def host_vars(tmp_path):
+    """Return a writable copy of the example host_vars directory."""
+    return Path(shutil.copytree(EXAMPLES / "host_vars", tmp_path / "host_vars"))
+
+
+@pytest.fixture
+def validated_documents(monkeypatch):
+    """Record the documents passed to the validator."""
+    validated: list = []
+    validate = JSONSchemaValidator._validate
+
+    def _validate(self, data):
+        validated.append(data["hostname"])
+        return validate(self, data)
+
+    monkeypatch.setattr(JSONSchemaValidator, "_validate", _validate)
+    return validated
+
+
+def test_results_are_memoized(schema_validator, validated_documents):
+    """Test that repeated access neither revalidates nor duplicates results."""
+    validator = schema_validator()
+    first = validator.results
+    second = validator.results
+
+    assert first == second
+    assert len(validated_documents) == 3
+
+
+def test_invalidate_revalidates_only_changed_documents(
+    schema_validator, validated_documents, host_vars
+):
+    """Test that only invalidated documents are revalidated."""
+    validator = schema_validator(document_path=str(host_vars))
+    before = validator.results
+    validated_documents.clear()
+
+    rtr001 = host_vars / "rtr001.yml"
+    rtr001.write_text(rtr001.read_text().replace("local_as: 65001", "local_as: 1"))
+    (host_vars / "rtr003.yml").unlink()
+    validator.invalidate([rtr001, host_vars / "rtr003.yml"])
+    after = validator.results
+
+    assert validated_documents == ["rtr001"]
+    assert {e["filename"] for e in before["errors"]} - {
+        e["filename"] for e in after["errors"]
+    } == {str(host_vars / "rtr003.yml")}
+    assert any(e["error"] and e["filename"] == str(rtr001) for e in after["errors"])
+
+
+def test_revalidate_validates_every_document(schema_validator, validated_documents):
+    """Test that revalidate discards memoized results."""
+    validator = schema_validator()
+    first = validator.results
+    assert validator.revalidate() == first
+    assert len(validated_documents) == 6
+
+
+def test_network_overlaps_are_checked_across_documents(tmp_path):
+    """Test that ip_no_overlap networks are checked across all documents."""
+    (tmp_path / "schema.yaml").write_text(
+        "properties:\n  subnets:\n    items:\n      ip_no_overlap: true\n"
+    )
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs/rtr001.yml").write_text("subnets: [10.1.0.0/16]\n")
+    (tmp_path / "docs/rtr002.yml").write_text("subnets: [10.2.0.0/16]\n")
+    (tmp_path / "docs/rtr003.yml").write_text("subnets: [10.3.0.0/16, 10.1.4.0/24]\n")
+
+    for jobs in (1, 2):
+        schema_validator = SchemaValidator(
+            document_path=str(tmp_path / "docs"),
+            schema=str(tmp_path / "schema.yaml"),
+            validator=JSONSchemaValidator(),
+            jobs=jobs,
+        )
+        schema_validator.initialize()
+        errors = [e for e in schema_validator.results["errors"] if e["error"]]
+
+        assert errors == [
+            {
+                "error": True,
+                "msg": f"'10.1.4.0/24' overlaps '10.1.0.0/16' in {tmp_path}/docs/rtr001.yml",
+                "key": "10.1.4.0/24",
+                "filename": str(tmp_path / "docs/rtr003.yml"),
+            }
+        ]
+
+
+def test_network_overlapping_a_rejected_network_is_reported(tmp_path):
+    """Test that a network overlapping only an already overlapping network is reported."""
+    (tmp_path / "schema.yaml").write_text(
+        "properties:\n  subnets:\n    items:\n      ip_no_overlap: true\n"
+    )
+    (tmp_path / "docs").mkdir()
+    for name, subnet in [("a", "10.0.0.0/24"), ("b", "10.0.0.0/16"), ("c", "10.0.5.0/24")]:
+        (tmp_path / f"docs/{name}.yml").write_text(f"subnets: [{subnet}]\n")
+
+    schema_validator = SchemaValidator(
+        document_path=str(tmp_path / "docs"),
+        schema=str(tmp_path / "schema.yaml"),
+        validator=JSONSchemaValidator(),
+    )
+    schema_validator.initialize()
+    errors = [
+        (e["filename"], e["msg"]) for e in schema_validator.results["errors"] if e["error"]
+    ]
+
+    assert errors == [
+        (
+            str(tmp_path / "docs/b.yml"),
+            f"'10.0.0.0/16' overlaps '10.0.0.0/24' in {tmp_path}/docs/a.yml",
+        ),
+        (
+            str(tmp_path / "docs/c.yml"),
+            f"'10.0.5.0/24' overlaps '10.0.0.0/16' in {tmp_path}/docs/b.yml",
+        ),
+    ]
+
+
+def test_unique_values_are_checked_across_documents(tmp_path):
+    """Test that unique_across_documents values are reported with both filenames."""
+    (tmp_path / "schema.yaml").write_text("unique_across_documents: [/router_id]\n")
+    (tmp_path / "docs").mkdir()
+    for name, router_id in [
+        ("rtr001", "10.0.0.1"),
+        ("rtr002", "10.0.0.2"),
+        ("rtr003", "10.0.0.1"),
+    ]:
+        (tmp_path / f"docs/{name}.yml").write_text(f"router_id: {router_id}\n")
+
+    schema_validator = SchemaValidator(
+        document_path=str(tmp_path / "docs"),
+        schema=str(tmp_path / "schema.yaml"),
+        validator=JSONSchemaValidator(),
+    )
+    schema_validator.initialize()
+    errors = [e for e in schema_validator.results["errors"] if e["error"]]
+
+    assert errors == [
+        {
+            "error": True,
+            "msg": f'"10.0.0.1" is also used at /router_id in {tmp_path}/docs/rtr001.yml',
+            "key": "/router_id",
+            "filename": str(tmp_path / "docs/rtr003.yml"),
+        }
+    ]
+
+
+def test_refresh_returns_changed_results(schema_validator, host_vars):
+    """Test that refresh validates everything once, then only invalidated documents."""
+    validator = schema_validator(document_path=str(host_vars))
+    rtr001 = host_vars / "rtr001.yml"
+
+    assert len(validator.refresh()) == 3
+    assert validator.refresh() == []
+
+    validator.invalidate([rtr001])
+    assert [result.filename for result in validator.refresh()] == [str(rtr001)]
+
+
+def test_refresh_rechecks_documents_across_documents(tmp_path):
+    """Test that refreshing a fixed document clears the errors it caused elsewhere."""
+    (tmp_path / "schema.yaml").write_text(
+        "unique_across_documents: [/router_id]\n"
+        "properties:\n  subnets:\n    items:\n      ip_no_overlap: true\n"
+    )
+    (tmp_path / "docs").mkdir()
+    a, b, c = (tmp_path / f"docs/{name}.yml" for name in "abc")
+    a.write_text("router_id: 10.0.0.1\nsubnets: [10.1.0.0/16]\n")
+    b.write_text("router_id: 10.0.0.1\nsubnets: [10.1.4.0/24]\n")
+    c.write_text("router_id: 10.0.0.3\nsubnets: [10.3.0.0/16]\n")
+
+    schema_validator = SchemaValidator(
+        document_path=str(tmp_path / "docs"),
+        schema=str(tmp_path / "schema.yaml"),
+        validator=JSONSchemaValidator(),
+    )
+    schema_validator.initialize()
+    assert [result.filename for result in schema_validator.refresh() if not result.valid] == [
+        str(b)
+    ]
+
+    a.write_text("router_id: 10.0.0.2\nsubnets: [10.2.0.0/16]\n")
+    schema_validator.invalidate([a])
+    assert [result.filename for result in schema_validator.refresh()] == [str(a), str(b)]
+    refreshed = schema_validator.results
+
+    assert refreshed == schema_validator.revalidate()
+    assert [e["filename"] for e in refreshed["errors"]] == [str(a), str(b), str(c)]
+    assert not any(e["error"] for e in refreshed["errors"])
+
+
+def test_invalidate_ignores_paths_that_are_not_documents(schema_validator, host_vars):
+    """Test that refresh skips changed files that revalidate would not validate."""
+    validator = schema_validator(document_path=str(host_vars))
+    first = validator.results
+    (host_vars / "site").mkdir()
+    (host_vars / "site" / "rtr004.yml").write_text("hostname: rtr004\n")
+    (host_vars / "notes.txt").write_text("notes\n")
+
+    validator.invalidate(
+        [host_vars / "site" / "rtr004.yml", host_vars / "notes.txt", EXAMPLES / "schema.yaml"]
+    )
+
+    assert validator.refresh() == []
+    assert validator.results == first == validator.revalidate()
+
+
+def test_invalidate_accepts_absolute_paths(schema_validator, host_vars, monkeypatch):
+    """Test that changed documents are matched whatever the form of their path."""
+    monkeypatch.chdir(host_vars.parent)
+    validator = schema_validator(document_path=host_vars.name)
+    validator.refresh()
+
+    validator.invalidate([host_vars / "rtr001.yml"])
+
+    assert [r.filename for r in validator.refresh()] == [f"{host_vars.name}/rtr001.yml"]
+    assert validator.results == validator.revalidate()
+
+
+class _ScriptedWatcher:
+    """A watcher replaying changes made by a list of steps, then stopping the loop."""
+
+    def __init__(self, steps):
+        self._steps = iter(steps)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def wait(self):
+        step = next(self._steps, None)
+        if step is None:
+            raise KeyboardInterrupt
+        return step()
+
+
+def test_watch_retries_a_schema_that_failed_to_load(tmp_path, monkeypatch):
+    """Test that a half-saved schema is loaded again on the next change, not validated."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    schema, document = tmp_path / "schema.yaml", docs / "rtr001.yml"
+    schema.write_text("type: object\n")
+    document.write_text("hostname: rtr001\n")
+    validators = []
+
+    def _factory():
+        validator = SchemaValidator(
+            document_path=str(docs), schema=str(schema), validator=JSONSchemaValidator()
+        )
+        validator.initialize()
+        validators.append(validator)
+        return validator
+
+    def _save_half_a_schema():
+        schema.write_text("required: [\n")
+        return {str(schema)}
+
+    def _save_a_document():
+        schema.write_text("required: [interfaces]\n")
+        document.write_text("hostname: rtr001-new\n")
+        return {str(document)}
+
+    watcher = _ScriptedWatcher([_save_half_a_schema, _save_a_document])
+    monkeypatch.setattr("src.watch.open_watcher", lambda *args, **kwargs: watcher)
+    console = Console(file=io.StringIO())
+
+    with pytest.raises(KeyboardInterrupt):
+        _watch(console, _factory, [str(docs)], str(schema), False, [], [], str(tmp_path))
+
+    assert len(validators) == 2
+    assert [r.filename for r in validators[-1].refresh()] == []
+    errors = validators[-1].results["errors"]
+    assert {e["filename"] for e in errors} == {str(document)}
+    assert any(e["error"] for e in errors)
+    assert "Error:" in console.file.getvalue()
@@ -0,0 +1,181 @@
+"""Module contains tests for the ResultCache and SchemaCache classes."""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.cache import ResultCache, SchemaCache
+from src.main import SchemaValidator
+from src.plugins.json_schema.validator import JSONSchemaValidator
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+def test_cache_round_trip(tmp_path):
+    """Test that stored results are returned for the same content."""
+    cache = ResultCache(tmp_path)
+    key = cache.key(b"hostname: rtr001")
+    results = {
+        "errors": [{"error": True, "msg": "bad", "key": "['hostname']"}],
+        "network_claims": [],
+    }
+
+    assert cache.get(key) is None
+    cache.set(key, results)
+    assert cache.get(key) == results
+
+
+def test_cache_key_depends_on_namespace(tmp_path):
+    """Test that a different schema or option set misses the cache."""
+    content = b"hostname: rtr001"
+    assert ResultCache(tmp_path, namespace="a").key(content) != ResultCache(
+        tmp_path, namespace="b"
+    ).key(content)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that eviction removes the oldest entries first."""
+    cache = ResultCache(tmp_path, max_size=len(b"{}"))
+    old, new = cache.key(b"old"), cache.key(b"new")
+    cache.set(old, {})
+    cache.set(new, {})
+    os.utime(cache._entry(old), (0, 0))
+
+    cache.evict()
+
+    assert cache.get(old) is None
+    assert cache.get(new) == {}
+
+
+def test_schema_validator_replays_cached_results(tmp_path, monkeypatch):
+    """Test that unchanged documents are not revalidated on a second run."""
+
+    def _schema_validator():
+        schema_validator = SchemaValidator(
+            document_path=str(EXAMPLES / "host_vars"),
+            schema=str(EXAMPLES / "schema.yaml"),
+            validator=JSONSchemaValidator(),
+            cache_dir=str(tmp_path),
+        )
+        schema_validator.initialize()
+        return schema_validator
+
+    first = _schema_validator().results
+
+    def _fail(self, data):
+        raise AssertionError("document was revalidated")
+
+    monkeypatch.setattr(JSONSchemaValidator, "_validate", _fail)
+    assert _schema_validator().results == first
+
+
+def test_cache_evict_keeps_a_running_size(tmp_path, monkeypatch):
+    """Test that once scanned, the cache is only scanned again when it outgrows max_size."""
+    cache = ResultCache(tmp_path, max_size=2 * len(b'{"errors": []}'))
+    old, new, newest = cache.key(b"old"), cache.key(b"new"), cache.key(b"newest")
+    cache.set(old, {"errors": []})
+    os.utime(cache._entry(old), (0, 0))
+    cache.evict()
+
+    def _fail(self, pattern):
+        raise AssertionError("cache was scanned")
+
+    monkeypatch.setattr(Path, "glob", _fail)
+    cache.evict(cache.set(new, {"errors": []}))
+
+    monkeypatch.undo()
+    cache.evict(cache.set(newest, {"errors": []}))
+    assert cache.get(old) is None
+    assert cache.get(new) == cache.get(newest) == {"errors": []}
+
+
+def test_cache_is_only_trimmed_after_writes(tmp_path, monkeypatch):
+    """Test that a run answered entirely from the cache does not scan it for eviction."""
+    evictions = []
+    monkeypatch.setattr(ResultCache, "evict", lambda self, written: evictions.append(written))
+
+    for _ in range(2):
+        schema_validator = SchemaValidator(
+            document_path=str(EXAMPLES / "host_vars"),
+            schema=str(EXAMPLES / "schema.yaml"),
+            validator=JSONSchemaValidator(),
+            cache_dir=str(tmp_path),
+        )
+        schema_validator.initialize()
+        assert schema_validator.results["errors"]
+
+    assert len(evictions) == 1
+
+
+def test_schema_cache_skips_unserializable_schemas(tmp_path):
+    """Test that a schema which is not plain JSON is not cached."""
+    cache = SchemaCache(tmp_path)
+    key = cache.key(b"const: 2024-01-01")
+
+    cache.set(key, {"schema": {"const": object()}})
+
+    assert cache.get(key) is None
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_schema_validator_reuses_prepared_schema(tmp_path, monkeypatch):
+    """Test that the prepared schema is read from the cache on a second run."""
+    kwargs = {
+        "document_path": str(EXAMPLES / "host_vars"),
+        "schema": str(EXAMPLES / "schema.yaml"),
+        "cache_dir": str(tmp_path),
+    }
+    first = SchemaValidator(validator=JSONSchemaValidator(), **kwargs)
+
+    def _fail(self, schema):
+        raise AssertionError("schema was prepared again")
+
+    monkeypatch.setattr(JSONSchemaValidator, "prepare_schema", _fail)
+    second = SchemaValidator(validator=JSONSchemaValidator(), **kwargs)
+
+    assert second._schema == first._schema
+    assert list((tmp_path / "schemas").glob("??/*.json"))
+
+
+def test_cache_inside_the_document_tree_is_not_validated(tmp_path):
+    """Test that cache entries are not picked up as documents on a second run."""
+    shutil.copytree(EXAMPLES / "host_vars", tmp_path / "host_vars")
+    kwargs = {
+        "document_path": str(tmp_path),
+        "schema": str(EXAMPLES / "schema.yaml"),
+        "cache_dir": str(tmp_path / ".net_schema_cache"),
+        "recursive": True,
+    }
+
+    def _results():
+        schema_validator = SchemaValidator(validator=JSONSchemaValidator(), **kwargs)
+        schema_validator.initialize()
+        return schema_validator.results
+
+    first = _results()
+
+    assert list((tmp_path / ".net_schema_cache").rglob("*.json"))
+    assert _results() == first
+
+
+def test_cache_key_depends_on_suffix(tmp_path):
+    """Test that the same bytes parsed as JSON and as YAML are cached separately."""
+    (tmp_path / "schema.yaml").write_text("properties:\n  v: {type: number}\n")
+    (tmp_path / "docs").mkdir()
+    for name in ("a.json", "b.yaml"):
+        (tmp_path / "docs" / name).write_text('{"v": 1e3}\n')
+
+    def _invalid():
+        schema_validator = SchemaValidator(
+            document_path=str(tmp_path / "docs"),
+            schema=str(tmp_path / "schema.yaml"),
+            validator=JSONSchemaValidator(),
+            cache_dir=str(tmp_path / "cache"),
+        )
+        schema_validator.initialize()
+        return [r.filename for r in schema_validator.iter_results() if not r.valid]
+
+    assert _invalid() == _invalid() == [str(tmp_path / "docs" / "b.yaml")]
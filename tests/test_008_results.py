@@ -0,0 +1,50 @@
+"""Module contains tests for the validation result types."""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.results import DocumentResult, ValidationResult
+
+
+def test_validation_result_renders_path_as_key():
+    """Test that the path is rendered in the format of the dict results."""
+    assert ValidationResult(error=True, msg="bad", path=("bgp", 0)).key == "['bgp', 0]"
+    assert ValidationResult(error=True, msg="bad", path=()).key == "None"
+    assert ValidationResult(error=False).key is None
+
+
+def test_validation_result_dict_round_trip():
+    """Test that to_dict produces the dict results and from_dict reverses it."""
+    result = ValidationResult(error=True, msg="bad", path=("bgp",), filename="rtr001.yml")
+    expected = {"error": True, "msg": "bad", "key": "['bgp']", "filename": "rtr001.yml"}
+
+    assert result.to_dict() == expected
+    assert ValidationResult.from_dict(expected).to_dict() == expected
+
+
+def test_validation_result_has_no_instance_dict():
+    """Test that results are slotted."""
+    assert not hasattr(ValidationResult(error=False), "__dict__")
+
+
+def test_document_result_valid():
+    """Test that a document is valid only if none of its results are errors."""
+    ok = ValidationResult(error=False)
+    bad = ValidationResult(error=True, msg="bad")
+
+    assert DocumentResult(filename="rtr001.yml", errors=[ok]).valid
+    assert not DocumentResult(filename="rtr001.yml", errors=[bad]).valid
+
+
+def test_document_result_dict_round_trip():
+    """Test that a document's results survive a round trip through to_dict."""
+    result = DocumentResult(
+        filename="rtr001.yml",
+        errors=[ValidationResult(error=True, msg="bad", path=("bgp",), filename="rtr001.yml")],
+    )
+    restored = DocumentResult.from_dict(result.to_dict())
+
+    assert restored.filename == "rtr001.yml"
+    assert restored.to_dict() == result.to_dict()
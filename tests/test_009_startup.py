@@ -0,0 +1,56 @@
+"""Module contains startup tests for the command line interface."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+# Modules the CLI must only import once validation or output starts.
+DEFERRED_MODULES = ("jsonschema", "referencing", "rich", "concurrent.futures.process")
+
+
+@pytest.fixture(scope="module")
+def import_times() -> dict[str, int]:
+    """Return the cumulative import time of each module imported by the CLI."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        import_times[module.strip()] = int(cumulative)
+    return import_times
+
+
+def test_cli_import_defers_heavy_modules(import_times):
+    """Test that importing the CLI does not import modules only needed to validate."""
+    imported = [
+        module
+        for module in import_times
+        if any(module == m or module.startswith(f"{m}.") for m in DEFERRED_MODULES)
+    ]
+    assert imported == []
+
+
+def test_cli_import_has_no_side_effects(tmp_path):
+    """Test that importing the CLI and validator creates no files."""
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import src.main, src.plugins.json_schema.validator",
+        ],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(ROOT)},
+        check=True,
+    )
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,132 @@
+"""Module contains tests for the validation server and client."""
+
+import json
+import shutil
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.main import SchemaValidator
+from src.plugins.json_schema.validator import JSONSchemaValidator
+from src.server import ServerError, ValidationServer, request_results
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+@pytest.fixture
+def schema(tmp_path):
+    """Return a writable copy of the example schema."""
+    return Path(shutil.copy(EXAMPLES / "schema.yaml", tmp_path / "schema.yaml"))
+
+
+@pytest.fixture
+def factory(schema):
+    """Return a factory for initialized SchemaValidator instances, counting calls."""
+
+    def _factory():
+        _factory.calls += 1
+        schema_validator = SchemaValidator(
+            document_path=[], schema=str(schema), validator=JSONSchemaValidator()
+        )
+        schema_validator.initialize()
+        return schema_validator
+
+    _factory.calls = 0
+    return _factory
+
+
+@pytest.fixture
+def server(tmp_path, schema, factory):
+    """Run a validation server in a background thread."""
+    server = ValidationServer(tmp_path / "net_schema.sock", factory, watch=[schema])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_client_results_match_local_validation(server, factory):
+    """Test that the server returns the results of validating in-process."""
+    remote = list(request_results(server.server_address, [EXAMPLES / "host_vars"]))
+    local = list(factory().iter_results([EXAMPLES / "host_vars"]))
+
+    def _errors(results):
+        return [(e.error, e.msg, e.key) for result in results for e in result.errors]
+
+    assert [Path(r.filename).resolve() for r in remote] == [Path(r.filename) for r in local]
+    assert _errors(remote) == _errors(local)
+
+
+def test_server_keeps_validator_between_requests(server, factory, schema):
+    """Test that the validator is reused until the schema changes."""
+    for _ in range(3):
+        list(request_results(server.server_address, [EXAMPLES / "host_vars"]))
+    assert factory.calls == 1
+
+    schema.write_text(schema.read_text() + "\n")
+    list(request_results(server.server_address, [EXAMPLES / "host_vars"]))
+    assert factory.calls == 2
+
+
+def test_server_rejects_invalid_requests(server):
+    """Test that malformed requests are answered with an error."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(server.server_address)
+        sock.sendall(b'{"paths": "rtr001.yml"}\n')
+        assert b"Invalid request" in sock.makefile("rb").readline()
+
+
+def test_server_reports_unparsable_documents(server, tmp_path):
+    """Test that an unparsable document is reported and the connection stays open."""
+    broken = tmp_path / "rtr001.yml"
+    broken.write_text("a: [1\n")
+
+    with pytest.raises(ServerError, match=f"^{broken}: "):
+        list(request_results(server.server_address, [broken]))
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(server.server_address)
+        stream = sock.makefile("rwb")
+        for paths in ([str(broken)], [str(EXAMPLES / "host_vars" / "rtr001.yml")]):
+            stream.write(json.dumps({"paths": paths}).encode() + b"\n")
+            stream.flush()
+        replies = [json.loads(stream.readline()) for _ in range(3)]
+
+    assert replies[0]["error"].startswith(f"{broken}: ")
+    assert "result" in replies[1]
+    assert replies[2] == {"done": True}
+
+
+def test_client_reports_missing_server(tmp_path):
+    """Test that connecting to a socket nobody listens on raises ServerError."""
+    with pytest.raises(ServerError, match="Cannot connect"):
+        list(request_results(tmp_path / "missing.sock", [EXAMPLES / "host_vars"]))
+
+
+def test_server_replaces_stale_socket(tmp_path, factory):
+    """Test that a socket left behind by a stopped server is replaced."""
+    path = tmp_path / "net_schema.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    server = ValidationServer(path, factory)
+    server.server_close()
+    assert not path.exists()
+
+
+def test_server_refuses_to_replace_other_files(tmp_path, factory):
+    """Test that an existing file which is not a socket is left alone."""
+    path = tmp_path / "net_schema.sock"
+    path.write_text("keep")
+
+    with pytest.raises(ServerError, match="not a socket"):
+        ValidationServer(path, factory)
+    assert path.read_text() == "keep"
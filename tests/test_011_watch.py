@@ -0,0 +1,110 @@
+"""Module contains tests for the document watchers."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.watch import InotifyWatcher, PollingWatcher, open_watcher
+
+
+def _inotify_watcher(*args, **kwargs):
+    try:
+        return InotifyWatcher(*args, **kwargs)
+    except (OSError, AttributeError):
+        pytest.skip("inotify is not available")
+
+
+def _polling_watcher(*args, **kwargs):
+    return PollingWatcher(*args, interval=0.01, **kwargs)
+
+
+@pytest.fixture(params=[_inotify_watcher, _polling_watcher], ids=["inotify", "polling"])
+def watcher_factory(request):
+    """Return a factory for each kind of watcher, closing them afterwards."""
+    watchers = []
+
+    def _watcher(*args, **kwargs):
+        watcher = request.param(*args, **kwargs)
+        watchers.append(watcher)
+        return watcher
+
+    yield _watcher
+    for watcher in watchers:
+        watcher.close()
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """Return a directory holding a document and a nested directory."""
+    (tmp_path / "rtr001.yml").write_text("hostname: rtr001\n")
+    (tmp_path / "site").mkdir()
+    (tmp_path / "site" / "rtr002.yml").write_text("hostname: rtr002\n")
+    return tmp_path
+
+
+def test_watcher_reports_modified_documents(watcher_factory, documents):
+    """Test that a modified document is reported."""
+    watcher = watcher_factory([str(documents)])
+    (documents / "rtr001.yml").write_text("hostname: rtr001-new\n")
+
+    assert watcher.wait(timeout=2) == {str(documents / "rtr001.yml")}
+
+
+def test_watcher_reports_created_and_deleted_documents(watcher_factory, documents):
+    """Test that created and deleted documents are reported."""
+    watcher = watcher_factory([str(documents)])
+    (documents / "rtr003.yml").write_text("hostname: rtr003\n")
+    (documents / "rtr001.yml").unlink()
+
+    changed = watcher.wait(timeout=2)
+    while changed is not None and len(changed) < 2:
+        changed |= watcher.wait(timeout=2) or set()
+
+    assert changed == {str(documents / "rtr003.yml"), str(documents / "rtr001.yml")}
+
+
+def test_watcher_ignores_other_files(watcher_factory, documents):
+    """Test that files not matching the include globs are not reported."""
+    watcher = watcher_factory([str(documents)])
+    (documents / "notes.txt").write_text("not a document\n")
+    (documents / "site" / "rtr002.yml").write_text("hostname: rtr002-new\n")
+
+    assert watcher.wait(timeout=0.5) == set()
+
+
+def test_watcher_recursive(watcher_factory, documents):
+    """Test that subdirectories are watched when recursive."""
+    watcher = watcher_factory([str(documents)], recursive=True)
+    (documents / "site" / "rtr002.yml").write_text("hostname: rtr002-new\n")
+
+    assert watcher.wait(timeout=2) == {str(documents / "site" / "rtr002.yml")}
+
+
+def test_watcher_ignores_pruned_directories(watcher_factory, documents):
+    """Test that pruned directories, such as the cache directory, are not watched."""
+    cache = documents / "cache"
+    cache.mkdir()
+    watcher = watcher_factory([str(documents)], recursive=True, prune=[cache])
+    (cache / "entry.json").write_text("{}")
+
+    assert watcher.wait(timeout=0.2) == set()
+
+
+def test_watcher_reports_extra_files(watcher_factory, documents, tmp_path_factory):
+    """Test that extra files, such as the schema, are reported."""
+    schema = tmp_path_factory.mktemp("schema") / "schema.yaml"
+    schema.write_text("type: object\n")
+    watcher = watcher_factory([str(documents)], files=[schema])
+    schema.write_text("type: object\nrequired: [hostname]\n")
+
+    assert watcher.wait(timeout=2) == {str(schema)}
+
+
+def test_open_watcher_returns_a_watcher(documents):
+    """Test that a watcher is returned whether or not inotify is available."""
+    with open_watcher([str(documents)]) as watcher:
+        assert isinstance(watcher, InotifyWatcher | PollingWatcher)
+        assert watcher.wait(timeout=0) == set()
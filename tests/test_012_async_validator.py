@@ -0,0 +1,225 @@
+"""Module contains tests for the AsyncSchemaValidator class."""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.async_validator import AsyncSchemaValidator
+from src.cache import ResultCache
+from src.main import SchemaValidator
+from src.plugins.json_schema.validator import JSONSchemaValidator
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+@pytest.fixture
+def schema(tmp_path):
+    """Return a schema requiring a unique hostname."""
+    schema = tmp_path / "schema.yaml"
+    schema.write_text(
+        "type: object\n"
+        "required: [hostname]\n"
+        "properties:\n"
+        "  hostname: {type: string}\n"
+        "unique_across_documents: [/hostname]\n"
+    )
+    return str(schema)
+
+
+def _run(coroutine_function, *args, **kwargs):
+    """Run an async function against a new AsyncSchemaValidator."""
+
+    async def _main():
+        async with AsyncSchemaValidator(*args, **kwargs) as validator:
+            return await coroutine_function(validator)
+
+    return asyncio.run(_main())
+
+
+def test_validate_document_accepts_text_and_parsed_documents(schema):
+    """Test that raw YAML and parsed documents are validated alike."""
+
+    async def _validate(validator):
+        return await asyncio.gather(
+            validator.validate_document("hostname: rtr001\n"),
+            validator.validate_document(b'{"hostname": 1}', suffix=".json"),
+            validator.validate_document({}, filename="empty"),
+        )
+
+    text, json_text, parsed = _run(_validate, schema, JSONSchemaValidator())
+
+    assert text.valid and text.unique_values == {"/hostname": ['"rtr001"']}
+    assert [e.msg for e in json_text.errors] == ["1 is not of type 'string'"]
+    assert parsed.filename == "empty"
+    assert [e.msg for e in parsed.errors] == ["'hostname' is a required property"]
+
+
+def test_concurrent_documents_keep_their_own_results(schema):
+    """Test that documents validated at the same time do not share state."""
+
+    async def _validate(validator):
+        return await asyncio.gather(
+            *(validator.validate_document({"hostname": f"rtr{i:03}"}) for i in range(200))
+        )
+
+    results = _run(_validate, schema, JSONSchemaValidator(), max_workers=8)
+
+    assert [r.unique_values["/hostname"] for r in results] == [
+        [f'"rtr{i:03}"'] for i in range(200)
+    ]
+
+
+def test_validate_paths_matches_schema_validator():
+    """Test that validate_paths returns the results of SchemaValidator, in order."""
+    host_vars = str(EXAMPLES / "host_vars")
+    schema = str(EXAMPLES / "schema.yaml")
+
+    async def _validate(validator):
+        return await validator.validate_paths([host_vars])
+
+    results = _run(_validate, schema, JSONSchemaValidator())
+    expected = SchemaValidator(host_vars, schema, JSONSchemaValidator())
+    expected.initialize()
+
+    assert [r.filename for r in results] == [r.filename for r in expected.iter_results()]
+    assert {"errors": [e.to_dict() for r in results for e in r.errors]} == expected.results
+
+
+def test_validate_paths_checks_across_documents(schema, tmp_path):
+    """Test that unique values are checked across the documents of a call."""
+    host_vars = tmp_path / "host_vars"
+    host_vars.mkdir()
+    (host_vars / "rtr001.yml").write_text("hostname: rtr001\n")
+    (host_vars / "rtr002.yml").write_text("hostname: rtr001\n")
+
+    async def _validate(validator):
+        return await validator.validate_paths([str(host_vars)])
+
+    first, second = _run(_validate, schema, JSONSchemaValidator())
+
+    assert first.valid
+    assert [e.msg for e in second.errors] == [
+        f'"rtr001" is also used at /hostname in {host_vars / "rtr001.yml"}'
+    ]
+
+
+def test_concurrent_validate_paths_check_their_own_documents(schema, tmp_path):
+    """Test that concurrent validate_paths calls do not share the checks spanning documents."""
+    for site in ("a", "b"):
+        (tmp_path / site).mkdir()
+        for i in range(10):
+            (tmp_path / site / f"rtr{i:03}.yml").write_text(f"hostname: rtr{i:03}\n")
+
+    async def _validate(validator):
+        return await asyncio.gather(
+            validator.validate_paths([str(tmp_path / "a")]),
+            validator.validate_paths([str(tmp_path / "b")]),
+        )
+
+    for results in _run(_validate, schema, JSONSchemaValidator(), max_pending=2):
+        assert len(results) == 10
+        assert all(result.valid for result in results)
+
+
+def test_validate_paths_trims_the_cache(schema, tmp_path, monkeypatch):
+    """Test that validate_paths trims the result cache after writing to it."""
+    evictions = []
+    monkeypatch.setattr(ResultCache, "evict", lambda self, written: evictions.append(written))
+    (tmp_path / "host_vars").mkdir()
+    (tmp_path / "host_vars" / "rtr001.yml").write_text("hostname: rtr001\n")
+
+    async def _validate(validator):
+        return await validator.validate_paths([str(tmp_path / "host_vars")])
+
+    for _ in range(2):
+        _run(_validate, schema, JSONSchemaValidator(), cache_dir=str(tmp_path / "cache"))
+
+    assert len(evictions) == 1 and evictions[0] > 0
+
+
+def test_pending_documents_are_bounded(schema, monkeypatch):
+    """Test that no more than max_workers documents are validated at once."""
+    active = peak = 0
+    lock = threading.Lock()
+    validate = JSONSchemaValidator._validate
+
+    def _validate(self, data):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return validate(self, data)
+
+    monkeypatch.setattr(JSONSchemaValidator, "_validate", _validate)
+
+    async def _validate_all(validator):
+        return await asyncio.gather(
+            *(validator.validate_document({"hostname": "rtr001"}) for _ in range(20))
+        )
+
+    results = _run(_validate_all, schema, JSONSchemaValidator(), max_workers=2)
+
+    assert all(result.valid for result in results)
+    assert peak <= 2
+
+
+def test_validate_paths_bounds_documents_in_flight(schema, tmp_path, monkeypatch):
+    """Test that validate_paths keeps at most max_pending documents in flight."""
+    (tmp_path / "host_vars").mkdir()
+    for i in range(20):
+        (tmp_path / f"host_vars/rtr{i:03}.yml").write_text(f"hostname: rtr{i:03}\n")
+    in_flight = peak = 0
+    run = AsyncSchemaValidator._run
+
+    async def _run_counted(self, func, *args):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await run(self, func, *args)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(AsyncSchemaValidator, "_run", _run_counted)
+
+    async def _validate(validator):
+        return await validator.validate_paths([str(tmp_path / "host_vars")])
+
+    results = _run(_validate, schema, JSONSchemaValidator(), max_workers=1, max_pending=2)
+
+    assert [Path(r.filename).name for r in results] == [f"rtr{i:03}.yml" for i in range(20)]
+    assert all(result.valid for result in results)
+    assert peak <= 2
+
+
+def test_event_loop_is_not_blocked(schema, monkeypatch):
+    """Test that the event loop keeps running while documents are validated."""
+    validate = JSONSchemaValidator._validate
+
+    def _slow_validate(self, data):
+        time.sleep(0.2)
+        return validate(self, data)
+
+    monkeypatch.setattr(JSONSchemaValidator, "_validate", _slow_validate)
+
+    async def _validate(validator):
+        ticks = 0
+        task = asyncio.create_task(validator.validate_document({"hostname": "rtr001"}))
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return ticks, task.result()
+
+    ticks, result = _run(_validate, schema, JSONSchemaValidator())
+
+    assert result.valid
+    assert ticks > 5
@@ -0,0 +1,129 @@
+"""Module contains tests for the output formats."""
+
+import io
+import json
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.formatters import (
+    JSONLinesFormatter,
+    JUnitFormatter,
+    SarifFormatter,
+    TableFormatter,
+)
+from src.results import DocumentResult, ValidationResult
+
+
+@pytest.fixture
+def results():
+    """Return the results of a valid and an invalid document."""
+    return [
+        DocumentResult(
+            filename="host_vars/rtr001.yml",
+            errors=[ValidationResult(error=False, filename="host_vars/rtr001.yml")],
+        ),
+        DocumentResult(
+            filename="host_vars/rtr 002.yml",
+            errors=[
+                ValidationResult(
+                    error=True,
+                    msg="'gi0/1' does not match '^eth[0-9]+$'",
+                    path=("interfaces", 0, "name"),
+                    filename="host_vars/rtr 002.yml",
+                ),
+                ValidationResult(
+                    error=True,
+                    msg="Duplicate key found: <&>",
+                    location="hostname",
+                    filename="host_vars/rtr 002.yml",
+                ),
+            ],
+        ),
+    ]
+
+
+def _format(formatter_class, results):
+    output = io.StringIO()
+    formatter = formatter_class(output)
+    for result in results:
+        formatter.add(result)
+    formatter.finish()
+    return output.getvalue()
+
+
+def test_jsonl_writes_a_line_per_document(results):
+    """Test that each document is written as a line of JSON."""
+    lines = [json.loads(line) for line in _format(JSONLinesFormatter, results).splitlines()]
+
+    assert [(line["filename"], line["valid"]) for line in lines] == [
+        ("host_vars/rtr001.yml", True),
+        ("host_vars/rtr 002.yml", False),
+    ]
+    assert lines[0]["errors"] == []
+    assert [error["key"] for error in lines[1]["errors"]] == [
+        "['interfaces', 0, 'name']",
+        "hostname",
+    ]
+
+
+def test_sarif_writes_a_result_per_error(results):
+    """Test that the SARIF log holds a result per error."""
+    log = json.loads(_format(SarifFormatter, results))
+    sarif_results = log["runs"][0]["results"]
+
+    assert log["version"] == "2.1.0"
+    assert log["runs"][0]["tool"]["driver"]["name"] == "net-schema"
+    assert [r["message"]["text"] for r in sarif_results] == [
+        "'gi0/1' does not match '^eth[0-9]+$'",
+        "Duplicate key found: <&>",
+    ]
+    location = sarif_results[0]["locations"][0]
+    assert location["physicalLocation"]["artifactLocation"]["uri"] == "host_vars/rtr%20002.yml"
+    assert location["logicalLocations"][0]["fullyQualifiedName"] == "['interfaces', 0, 'name']"
+
+
+def test_sarif_without_results_is_valid():
+    """Test that an empty run is still a complete SARIF log."""
+    assert json.loads(_format(SarifFormatter, []))["runs"][0]["results"] == []
+
+
+def test_junit_writes_a_test_case_per_document(results):
+    """Test that each document is a test case, failed when it has errors."""
+    root = ET.fromstring(_format(JUnitFormatter, results))  # noqa: S314
+    testcases = list(root.iter("testcase"))
+
+    assert [testcase.get("name") for testcase in testcases] == [
+        "host_vars/rtr001.yml",
+        "host_vars/rtr 002.yml",
+    ]
+    assert testcases[0].find("failure") is None
+    failure = testcases[1].find("failure")
+    assert failure.get("message") == "2 errors"
+    assert failure.text.splitlines() == [
+        "['interfaces', 0, 'name']: 'gi0/1' does not match '^eth[0-9]+$'",
+        "hostname: Duplicate key found: <&>",
+    ]
+
+
+@pytest.mark.parametrize(
+    "formatter_class", [JSONLinesFormatter, SarifFormatter, JUnitFormatter]
+)
+def test_results_are_written_as_they_are_added(formatter_class, results):
+    """Test that a document's results are written before the next one arrives."""
+    output = io.StringIO()
+    formatter = formatter_class(output)
+
+    formatter.add(results[1])
+    assert "rtr" in output.getvalue()
+
+
+def test_table_lists_every_result(results):
+    """Test that the table has a row per result."""
+    output = _format(TableFormatter, results)
+
+    assert output.count("host_vars/rtr") == 3
@@ -0,0 +1,97 @@
+"""Module contains tests for profiling validation."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from jsonschema import Draft7Validator
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.main import SchemaValidator
+from src.plugins.json_schema.validator import JSONSchemaValidator
+from src.profiling import Profile
+from src.results import DocumentResult
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "asn": {"type": "string", "asn_public": True},
+        "vlans": {"type": "array", "items": {"vlan": True}},
+    },
+}
+
+
+def test_profile_counts_keyword_calls():
+    """Test that profiling counts the calls of built-in and custom keywords."""
+    validator = JSONSchemaValidator(profile=True)
+    validator.initialize(SCHEMA)
+    result = validator.results({"asn": "8000", "vlans": [10, 20, 5000]})
+
+    assert any(error["error"] for error in result)
+    assert validator.keyword_times["properties"][0] == 1
+    assert validator.keyword_times["items"][0] == 1
+    # Arrays of VLAN IDs are range checked at once; only the offending ID is descended.
+    assert validator.keyword_times["vlan"][0] == 1
+    assert validator.keyword_times["type"][0] == 3
+    assert all(seconds >= 0 for _, seconds in validator.keyword_times.values())
+
+    validator.results({"asn": "8000"})
+    assert "vlan" not in validator.keyword_times
+
+
+def test_profile_reports_the_same_results():
+    """Test that profiling leaves the results and Draft7Validator unchanged."""
+    keywords = dict(Draft7Validator.VALIDATORS)
+    data = {"asn": "65000", "vlans": [10, 4095, "a"]}
+    plain, profiled = JSONSchemaValidator(), JSONSchemaValidator(profile=True)
+    plain.initialize(SCHEMA)
+    profiled.initialize(SCHEMA)
+
+    assert profiled.results(data) == plain.results(data)
+    assert plain.keyword_times == {}
+    assert Draft7Validator.VALIDATORS == keywords
+
+
+def test_documents_carry_timings_when_profiling():
+    """Test that document results carry timings only when profiling."""
+    results = {}
+    for profile in (False, True):
+        schema_validator = SchemaValidator(
+            document_path=str(EXAMPLES / "host_vars"),
+            schema=str(EXAMPLES / "schema.yaml"),
+            validator=JSONSchemaValidator(profile=profile),
+            jobs=2,
+        )
+        schema_validator.initialize()
+        results[profile] = list(schema_validator.iter_results())
+
+    assert all(result.profile is None for result in results[False])
+    assert all(result.profile["keywords"] for result in results[True])
+    assert [r.errors for r in results[True]] == [r.errors for r in results[False]]
+
+
+def test_profile_aggregates_documents():
+    """Test that the profile sums timings and keeps the slowest documents."""
+    profile = Profile(slowest=2)
+    for filename, parse, validate in [("a", 1.0, 1.0), ("b", 0.5, 3.0), ("c", 0.1, 0.1)]:
+        profile.add(
+            DocumentResult(
+                filename=filename,
+                errors=[],
+                profile={
+                    "parse": parse,
+                    "validate": validate,
+                    "keywords": {"type": [2, validate / 2]},
+                },
+            )
+        )
+    profile.add(DocumentResult(filename="cached", errors=[]))
+
+    assert profile.documents == 3
+    assert profile.parse_time == pytest.approx(1.6)
+    assert profile.validate_time == pytest.approx(4.1)
+    assert profile.keywords["type"] == [6, pytest.approx(2.05)]
+    assert [filename for _, filename, _, _ in profile.slowest] == ["b", "a"]
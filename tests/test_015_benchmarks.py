@@ -0,0 +1,42 @@
+"""Module contains tests for the benchmark inventory generator and baseline comparison."""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.inventory import INVALID_EVERY, generate_inventory
+from benchmarks.suite import SCHEMA, compare
+from src.main import SchemaValidator
+from src.plugins.json_schema.validator import JSONSchemaValidator
+
+
+def test_generated_inventory_matches_the_example_schema(tmp_path):
+    """Test that every INVALID_EVERYth generated router, and only those, fails validation."""
+    paths = generate_inventory(tmp_path, 2 * INVALID_EVERY)
+    assert len(paths) == len(list(tmp_path.glob("*.yml"))) == 2 * INVALID_EVERY
+
+    schema_validator = SchemaValidator(
+        document_path=str(tmp_path), schema=str(SCHEMA), validator=JSONSchemaValidator()
+    )
+    schema_validator.initialize()
+    invalid = [
+        result.filename for result in schema_validator.iter_results() if not result.valid
+    ]
+
+    assert [Path(filename).name for filename in invalid] == [
+        paths[INVALID_EVERY - 1].name,
+        paths[2 * INVALID_EVERY - 1].name,
+    ]
+
+
+def test_compare_flags_drops_beyond_the_threshold():
+    """Test that only throughput below the baseline by more than the threshold regresses."""
+    baseline = {"results": {"1000": {"parse": 100.0, "validate": 100.0}}}
+    results = {"1000": {"parse": 80.0, "validate": 70.0, "cli": 10.0}}
+
+    assert compare(results, baseline, threshold=0.25) == [
+        ("1000", "parse", 80.0, 100.0, False),
+        ("1000", "validate", 70.0, 100.0, True),
+        ("1000", "cli", 10.0, None, False),
+    ]